@@ -8,6 +8,7 @@ const fileList = $("#fileList");
 const fileToggle = $("#fileToggle");
 const statusEl = $("#status");
 const submitBtn = $("#submitBtn");
+const streamInput = $("#stream");
 const table = $("#results");
 const tbody = $("#results tbody");
 const countEl = $("#count");
@@ -88,6 +89,19 @@ function toRows(arr) {
     }));
 }
 
+// format=columns: {"columns": [...], "data": {column: [values]}}, one array per field
+function fromColumns(data) {
+    const cols = data.data || {};
+    const n = data.count ?? (cols.score || []).length;
+    const out = new Array(n);
+    for (let i = 0; i < n; i++) {
+        const r = {};
+        for (const c of data.columns || []) r[c] = cols[c][i];
+        out[i] = r;
+    }
+    return out;
+}
+
 function render(rows) {
     const q = filterInput.value.trim().toLowerCase();
     const filtered = q
@@ -173,21 +187,66 @@ form.addEventListener("submit", async (e) => {
     fd.append("min_years", $("#min_years").value || "0");
     fd.append("notes", $("#notes").value);
 
+    const streaming = streamInput.checked;
+    if (streaming) fd.append("stream", "ndjson");
+    else fd.append("format", "columns");
+
     submitBtn.disabled = true;
     setStatus("Uploading and scoring...");
     try {
         const base = apiInput.value.replace(/\/+$/, "");
         const res = await fetch(`${base}/score/pdfs`, { method: "POST", body: fd });
         if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        if (streaming && res.body) { await readStream(res); return; }
         const data = await res.json();
 
-        const rows = toRows(data.results || []);
+        const rows = toRows(data.format === "columns" ? fromColumns(data) : (data.results || []));
         lastResults = sortRows(rows);
         render(lastResults);
-        setStatus(`Done. ${data.count ?? rows.length} candidates scored.`);
+        const dups = (data.duplicates || []).length;
+        setStatus(`Done. ${data.count ?? rows.length} candidates scored${dups ? `, ${dups} duplicates skipped` : ""}.`);
     } catch (err) {
         setStatus(`Error: ${err.message || err}`);
     } finally {
         submitBtn.disabled = false;
     }
 });
+
+// NDJSON: one {"type": "candidate" | "duplicate" | "error" | "summary", ...} object per line
+async function readStream(res) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    const total = fileInput.files.length;
+    let buf = "", done = 0, failed = 0, dups = 0, pending = false, finished = false;
+    lastResults = [];
+    render(lastResults);
+
+    const flush = () => {
+        pending = false;
+        lastResults = sortRows(lastResults);
+        render(lastResults);
+        if (!finished) setStatus(`Scoring... ${done + failed + dups}/${total} processed${failed ? `, ${failed} failed` : ""}`);
+    };
+    const handle = (line) => {
+        if (!line.trim()) return;
+        const ev = JSON.parse(line);
+        if (ev.type === "candidate") { lastResults.push(...toRows([ev])); done++; }
+        else if (ev.type === "error") failed++;
+        else if (ev.type === "duplicate") dups++;
+        else if (ev.type === "summary") done = ev.count ?? done;
+        if (!pending) { pending = true; requestAnimationFrame(flush); }
+    };
+
+    for (;;) {
+        const { value, done: eof } = await reader.read();
+        if (eof) break;
+        buf += decoder.decode(value, { stream: true });
+        const lines = buf.split("\n");
+        buf = lines.pop();
+        lines.forEach(handle);
+    }
+    handle(buf + decoder.decode());
+    finished = true;
+    flush();
+    setStatus(`Done. ${done} candidates scored${failed ? `, ${failed} failed` : ""}${dups ? `, ${dups} duplicates skipped` : ""}.`);
+}
@@ -1,16 +1,41 @@
-import io, os, tempfile, shutil
+import io, os, json, tempfile, shutil, time
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any
 import pandas as pd
-from fastapi import FastAPI, File, UploadFile, Form
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 
-from profile_ingest_pdf import run_to_df
+import metrics
+from metrics import timed
+
+from profile_ingest_pdf import iter_parse, parse_many, rows_to_df, INGEST_WORKERS, INGEST_TIMEOUT, EXTRACTOR_VERSION, COLUMNS, load_pdf_backend
+from parse_cache import cache_from_env
+from candidate_store import store_from_env
+from batch_queue import queue_from_env
+from uploads import BodyLimit, spool_uploads
+from skill_index import SkillIndex, FIELDS as INDEX_FIELDS, search as index_search
 from quick_clean import clean_df
-from scorer import score_df
+from scorer import compile_job, score_df, score_many
+from dedup import DedupIndex, signature
+from skill_vectors import VectorsUnavailable
+import encoding
+import warmup
+
+@asynccontextmanager
+async def _lifespan(app):
+    # before the batch and warm-up threads exist, so no thread is ever mid-import of it
+    load_pdf_backend()
+    if BATCHES is not None: BATCHES.start()
+    warmup.start()   # in the background: requests are served meanwhile, just not pre-warmed
+    yield
+    if BATCHES is not None: BATCHES.stop()
 
-app = FastAPI(title="Candidate Scorer API", version="1.0.0")
+app = FastAPI(title="Candidate Scorer API", version="1.0.0", lifespan=_lifespan)
+# inside CORS, so a 413 still carries the CORS headers the browser needs to read it
+app.add_middleware(BodyLimit)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -19,8 +44,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-NEEDED_COLS = ["name","age","phone","email","address","degree","years_experience",
-               "skills","soft_skills","languages","profile_text","url"]
+PARSE_CACHE = cache_from_env(EXTRACTOR_VERSION)
+STORE = store_from_env()
+INDEX = SkillIndex.from_df(STORE.candidates(columns=INDEX_FIELDS)) if STORE is not None else None
+BATCHES = queue_from_env(PARSE_CACHE)
+
+def _cache_gauge(field: str):
+    return lambda: {(): PARSE_CACHE.stats()[field]} if PARSE_CACHE is not None else {}
+
+for _field, _help in [("entries", "Rows in the parse cache."), ("bytes", "Size of the cached rows."),
+                      ("hits", "Parse cache hits since start."), ("misses", "Parse cache misses since start."),
+                      ("evictions", "Parse cache evictions since start.")]:
+    metrics.REGISTRY.add(metrics.Gauge(f"parse_cache_{_field}", _help, fn=_cache_gauge(_field)))
+metrics.REGISTRY.add(metrics.Gauge("batches", "Background batches by status.", ("status",),
+                                   fn=lambda: {(k,): v for k, v in BATCHES.counts().items()} if BATCHES is not None else {}))
+
+@app.middleware("http")
+async def _time_requests(request: Request, call_next):
+    t = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # route template, not the raw path, so /candidates/{id} stays one series
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - t, method=request.method, route=route, status=status)
+
+NEEDED_COLS = COLUMNS
 
 def _ensure_cols(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -28,8 +80,159 @@ def _ensure_cols(df: pd.DataFrame) -> pd.DataFrame:
         if c not in df.columns: df[c] = ""
     return df[NEEDED_COLS]
 
+def _iter_uploads(uploads: List[Dict[str, Any]]):
+    return iter_parse([u["path"] for u in uploads], INGEST_WORKERS, INGEST_TIMEOUT,
+                      cache=PARSE_CACHE, digests=[u["sha256"] for u in uploads])
+
+def _ingest(uploads: List[Dict[str, Any]], errors: List[Dict[str, str]], duplicates=None) -> pd.DataFrame:
+    rows, errs = parse_many([u["path"] for u in uploads], INGEST_WORKERS, INGEST_TIMEOUT,
+                            cache=PARSE_CACHE, digests=[u["sha256"] for u in uploads], duplicates=duplicates)
+    errors.extend(errs)
+    df = _ensure_cols(rows_to_df(rows)).fillna("")
+    with timed("clean_df"): return clean_df(df).fillna("")
+
+def _records(out: pd.DataFrame) -> List[Dict[str, Any]]:
+    return out.where(pd.notnull(out), None).to_dict(orient="records")
+
+def _score_uploads(uploads: List[Dict[str, Any]], cfg: Dict[str, Any]):
+    errors: List[Dict[str, str]] = []
+    duplicates: List[Dict[str, Any]] = []
+    df = _ingest(uploads, errors, duplicates)
+    with timed("score_df"): out = score_df(df, cfg).reset_index(drop=True)
+    return out, {"errors": errors, "duplicates": duplicates}
+
+def _encode_scored(out: pd.DataFrame, extra: Dict[str, Any], fmt: str, text: bool, meta=None):
+    """Response body and media type for a scored frame (best first) in one of encoding.FORMATS."""
+    n = int(len(out))
+    if fmt == "records":
+        results = encoding.records(encoding.visible(out, text))
+        return encoding.dumps({"count": n, "top5": results[:5], "results": results, **extra}), "application/json"
+    # compact formats: rows are already ranked, so top5 is just the first indices
+    head = {"count": n, "format": fmt, "top5": list(range(min(n, 5))), **extra}
+    if fmt == "arrow":
+        return encoding.arrow_ipc(encoding.visible(out, text), {**head, **(meta or {})}), encoding.ARROW_TYPE
+    return encoding.dumps({**head, **encoding.columns(encoding.visible(out, text))}), "application/json"
+
+STREAM_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+def _stream_events(tmpdir: str, uploads: List[Dict[str, Any]], cfg: Dict[str, Any]):
+    # each candidate is cleaned and scored on its own as soon as its PDF is parsed;
+    # scores don't depend on the rest of the batch, so they equal the batch results
+    scored: List[Dict[str, Any]] = []
+    errors = dups = 0
+    seen = DedupIndex()
+    parsed = _iter_uploads(uploads)
+    try:
+        for i, row, err in parsed:
+            if err is not None:
+                errors += 1
+                yield "error", {"index": i, **err}
+                continue
+            sig = signature(row.get("profile_text"))
+            hit = seen.match(row, sig)
+            if hit is not None:
+                dups += 1
+                metrics.PDFS.inc(outcome="duplicate")
+                yield "duplicate", {"index": i, "file": uploads[i]["filename"], "duplicate_of": hit[0],
+                                    "match": hit[1], "similarity": hit[2]}
+                continue
+            seen.add(i, row, sig)
+            with timed("clean_df"): df = clean_df(_ensure_cols(rows_to_df([row])).fillna("")).fillna("")
+            with timed("score_df"): rec = encoding.records(score_df(df, cfg))[0]
+            scored.append((i, rec["score"]))
+            yield "candidate", {"index": i, **rec}
+        # back in upload order and ranked with score_df's own sort, so ties don't follow
+        # completion order and the ranking is the one /score/pdfs returns
+        scored.sort()
+        order = pd.Series([s for _, s in scored], dtype="float64").sort_values(ascending=False).index
+        ranking = [scored[j][0] for j in order]
+        yield "summary", {"count": len(scored), "errors": errors, "duplicates": dups, "ranking": ranking, "top5": ranking[:5]}
+    finally:
+        # also runs when the client disconnects: queued files are cancelled, not left to the pool
+        parsed.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _stream_lines(tmpdir: str, uploads: List[Dict[str, Any]], cfg: Dict[str, Any], mode: str):
+    for event, data in _stream_events(tmpdir, uploads, cfg):
+        with timed("encode"): body = encoding.dumps({"type": event, **data}).decode("utf-8")
+        yield f"event: {event}\ndata: {body}\n\n" if mode == "sse" else body + "\n"
+
+async def _stream_body(lines):
+    # StreamingResponse would run `lines` in the threadpool but never close it when the client
+    # goes away; closing it here runs _stream_events' cleanup once the current step returns
+    try:
+        async for line in iterate_in_threadpool(lines):
+            yield line
+    finally:
+        await run_in_threadpool(lines.close)
+
+def _job_cfg(degree, req, nice, soft_req, soft_nice, langs, min_years, notes, weights="", match="exact") -> Dict[str, Any]:
+    cfg = dict(degree=degree, req=req, nice=nice, soft_req=soft_req,
+               soft_nice=soft_nice, langs=langs, min_years=min_years, notes=notes)
+    if match and match.lower() != "exact": cfg["match"] = match
+    if weights:
+        try:
+            cfg["weights"] = json.loads(weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"invalid weights: {e}")
+    try:
+        compile_job(cfg)   # validates, and warms the cache for the scoring call
+    except VectorsUnavailable as e:
+        # the server's vectors file, not the request, is at fault
+        raise HTTPException(status_code=503, detail=str(e))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"invalid job: {e}")
+    return cfg
+
+JOB_FIELDS = ("degree", "req", "nice", "soft_req", "soft_nice", "langs", "min_years", "notes", "weights", "match")
+MAX_JOBS = int(os.getenv("SCORE_MAX_JOBS") or 500)
+
+def _job_list(jobs: str):
+    """(items, cfgs) from the `jobs` form field of /score/jobs: a JSON list of job objects.
+
+    Each may carry an `id` that is echoed back; the rest is validated like _job_cfg.
+    """
+    try:
+        items = json.loads(jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"invalid jobs: {e}")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="jobs must be a non-empty JSON list")
+    if len(items) > MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_JOBS} jobs per request")
+    cfgs = []
+    for j, item in enumerate(items):
+        if not isinstance(item, dict): raise HTTPException(status_code=400, detail=f"job {j}: expected an object")
+        unknown = sorted(set(item) - set(JOB_FIELDS) - {"id"})
+        if unknown: raise HTTPException(status_code=400, detail=f"job {j}: unknown fields {', '.join(unknown)}")
+        cfg = {k: v for k, v in item.items() if k != "id"}
+        try:
+            compile_job(cfg)
+        except VectorsUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPException(status_code=400, detail=f"job {j}: {e}")
+        cfgs.append(cfg)
+    return items, cfgs
+
+def _require_store():
+    if STORE is None:
+        raise HTTPException(status_code=503, detail="candidate store disabled (CANDIDATE_DB_PATH is empty)")
+    return STORE
+
 @app.get("/health")
-def health(): return {"ok": True}
+def health(): return {"ok": True, "warmup": warmup.status()["status"]}
+
+@app.get("/warmup")
+def warmup_status(): return warmup.status()
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/cache/stats")
+def cache_stats():
+    return PARSE_CACHE.stats() if PARSE_CACHE is not None else {"enabled": False}
 
 @app.post("/score/pdfs")
 async def score_pdfs(
@@ -41,29 +244,248 @@ async def score_pdfs(
     soft_nice: str = Form(""),
     langs: str = Form(""),
     min_years: float = Form(0.0),
-    notes: str = Form("")
+    notes: str = Form(""),
+    weights: str = Form("", description='JSON overriding score weights, e.g. {"req_hard": 0.5}'),
+    match: str = Form("exact", description='"semantic" also matches close skills via SKILL_VECTORS_PATH'),
+    stream: str = Form("", description="'ndjson' or 'sse' to stream each candidate as it is scored"),
+    profile: bool = Form(False, description="add a per-stage timing breakdown to the response"),
+    format: str = Form("records", description="'records', or the compact 'columns' / 'arrow' layouts"),
+    text: bool | None = Form(None, description="include profile_text (default: only with format=records)")
 ):
+    if stream and stream not in STREAM_TYPES:
+        raise HTTPException(status_code=400, detail=f"stream must be one of {sorted(STREAM_TYPES)}")
+    if format not in encoding.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(encoding.FORMATS)}")
+    if format == "arrow" and encoding.pyarrow is None:
+        raise HTTPException(status_code=400, detail="format=arrow needs pyarrow installed on the server")
     tmpdir = tempfile.mkdtemp(prefix="pdf_ingest_")
+    # the threadpool call below runs in a copy of this context, so its stages land in `prof` too
+    with metrics.profiling(metrics.Profile() if profile and not stream else None) as prof:
+        try:
+            with timed("upload"): uploads = await spool_uploads(files, tmpdir)
+            cfg = _job_cfg(degree, req, nice, soft_req, soft_nice, langs, min_years, notes, weights, match)
+            if stream:
+                # the generator owns tmpdir from here and removes it when the stream ends
+                lines, tmpdir = _stream_lines(tmpdir, uploads, cfg, stream), None
+                return StreamingResponse(_stream_body(lines), media_type=STREAM_TYPES[stream],
+                                         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+            # parsing/scoring is CPU-bound: keep it off the event loop so /health etc. stay responsive
+            out, extra = await run_in_threadpool(_score_uploads, uploads, cfg)
+            text = format == "records" if text is None else text
+            # arrow carries the profile in its schema metadata, so it is taken before encoding there
+            meta = {"profile": prof.report()} if prof is not None and format == "arrow" else None
+            with timed("encode"): body, media = await run_in_threadpool(_encode_scored, out, extra, format, text, meta)
+            if prof is not None and format != "arrow":
+                body = body[:-1] + b',"profile":' + encoding.dumps(prof.report()) + b"}"
+            return Response(content=body, media_type=media)
+        finally:
+            if tmpdir: shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _score_jobs(uploads: List[Dict[str, Any]], items: List[Dict[str, Any]], cfgs: List[Dict[str, Any]],
+                k: int, best: int) -> Dict[str, Any]:
+    errors: List[Dict[str, str]] = []
+    duplicates: List[Dict[str, Any]] = []
+    df = _ingest(uploads, errors, duplicates)
+    with timed("score_many"): tops, fits = score_many(df, cfgs, k=k, best=best)
+    ids = [item.get("id", j) for j, item in enumerate(items)]
+    with timed("encode"):
+        jobs = [{"job": j, "id": ids[j], "results": encoding.records(encoding.visible(top))} for j, top in enumerate(tops)]
+        who = df[["name", "email", "url"]].to_dict(orient="records")
+        candidates = [{"index": i, **who[i], "best": [{"job": j, "id": ids[j], "score": s} for j, s in zip(js, ss)]}
+                      for i, (js, ss) in enumerate(zip(fits["best_jobs"], fits["best_scores"]))]
+        return encoding.dumps({"count": len(df), "jobs": jobs, "candidates": candidates,
+                               "errors": errors, "duplicates": duplicates})
+
+@app.post("/score/jobs")
+async def score_jobs(
+    files: List[UploadFile] = File(..., description="One or more PDFs"),
+    jobs: str = Form(..., description='JSON list of jobs, e.g. [{"id": "backend", "req": "python", "min_years": 3}]'),
+    k: int = Form(10, description="top candidates returned per job"),
+    best: int = Form(3, description="best-fitting jobs returned per candidate"),
+    profile: bool = Form(False, description="add a per-stage timing breakdown to the response")
+):
+    items, cfgs = _job_list(jobs)
+    tmpdir = tempfile.mkdtemp(prefix="pdf_ingest_")
+    with metrics.profiling(metrics.Profile() if profile else None) as prof:
+        try:
+            with timed("upload"): uploads = await spool_uploads(files, tmpdir)
+            # PDFs are parsed and candidates encoded once, then scored against every job in one pass
+            body = await run_in_threadpool(_score_jobs, uploads, items, cfgs, k, best)
+            if prof is not None: body = body[:-1] + b',"profile":' + encoding.dumps(prof.report()) + b"}"
+            return Response(content=body, media_type="application/json")
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+# ---------------- candidate store ----------------
+def _ingest_to_store(uploads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    store = _require_store()
+    errors: List[Dict[str, str]] = []
+    df = _ingest(uploads, errors)
+    res = store.upsert(df)
+    changed = res["added"] + res["updated"]
+    # only the new/changed candidates are re-scored, against every stored job
+    if changed:
+        fresh = store.candidates(changed, tokens=True)
+        for row in fresh.to_dict(orient="records"):
+            INDEX.add(row["id"], row)
+        for job in store.jobs():
+            with timed("score_df"): scored = score_df(fresh, job["cfg"])
+            store.save_scores(job["id"], scored)
+    return {**res, "errors": errors}
+
+@app.post("/candidates")
+async def add_candidates(files: List[UploadFile] = File(..., description="One or more PDFs"),
+                         profile: bool = Form(False, description="add a per-stage timing breakdown to the response")):
+    _require_store()
+    tmpdir = tempfile.mkdtemp(prefix="pdf_ingest_")
+    with metrics.profiling(metrics.Profile() if profile else None) as prof:
+        try:
+            with timed("upload"): uploads = await spool_uploads(files, tmpdir)
+            out = await run_in_threadpool(_ingest_to_store, uploads)
+            if prof is not None: out["profile"] = prof.report()
+            return out
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+@app.get("/candidates")
+def list_candidates(offset: int = 0, limit: int = 50):
+    store = _require_store()
+    return {"count": store.count(), "results": _records(store.candidates(offset=offset, limit=limit))}
+
+@app.get("/candidates/{candidate_id}")
+def get_candidate(candidate_id: int):
+    df = _require_store().candidates([candidate_id])
+    if not len(df): raise HTTPException(status_code=404, detail="candidate not found")
+    return _records(df)[0]
+
+@app.delete("/candidates/{candidate_id}")
+def delete_candidate(candidate_id: int):
+    if not _require_store().delete(candidate_id):
+        raise HTTPException(status_code=404, detail="candidate not found")
+    INDEX.remove(candidate_id)
+    return {"deleted": candidate_id}
+
+def _search(cfg: Dict[str, Any], k: int) -> Dict[str, Any]:
+    store = _require_store()
+    out = index_search(INDEX, lambda ids: store.candidates(ids, tokens=True), cfg, k)
+    return {"count": int(len(out)), "results": _records(out)}
+
+@app.post("/candidates/search")
+async def search_candidates(
+    degree: str = Form(""),
+    req: str = Form(""),
+    nice: str = Form(""),
+    soft_req: str = Form(""),
+    soft_nice: str = Form(""),
+    langs: str = Form(""),
+    min_years: float = Form(0.0),
+    notes: str = Form(""),
+    weights: str = Form("", description='JSON overriding score weights, e.g. {"req_hard": 0.5}'),
+    match: str = Form("exact", description='"semantic" also matches close skills via SKILL_VECTORS_PATH'),
+    k: int = Form(5)
+):
+    _require_store()
+    cfg = _job_cfg(degree, req, nice, soft_req, soft_nice, langs, min_years, notes, weights, match)
+    return JSONResponse(content=jsonable_encoder(await run_in_threadpool(_search, cfg, k)))
+
+def _create_job(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    store = _require_store()
+    job_id = store.add_job(cfg)
+    pool = store.candidates(tokens=True)
+    if len(pool):
+        store.save_scores(job_id, score_df(pool, cfg))
+    return {"id": job_id, "cfg": cfg, "scored": int(len(pool))}
+
+@app.post("/jobs")
+async def create_job(
+    degree: str = Form(""),
+    req: str = Form(""),
+    nice: str = Form(""),
+    soft_req: str = Form(""),
+    soft_nice: str = Form(""),
+    langs: str = Form(""),
+    min_years: float = Form(0.0),
+    notes: str = Form(""),
+    weights: str = Form("", description='JSON overriding score weights, e.g. {"req_hard": 0.5}'),
+    match: str = Form("exact", description='"semantic" also matches close skills via SKILL_VECTORS_PATH')
+):
+    _require_store()
+    cfg = _job_cfg(degree, req, nice, soft_req, soft_nice, langs, min_years, notes, weights, match)
+    return await run_in_threadpool(_create_job, cfg)
+
+@app.get("/jobs")
+def list_jobs():
+    return {"results": _require_store().jobs()}
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: int):
+    if not _require_store().delete_job(job_id):
+        raise HTTPException(status_code=404, detail="job not found")
+    return {"deleted": job_id}
+
+@app.get("/jobs/{job_id}/scores")
+def job_scores(job_id: int, offset: int = 0, limit: int = 50):
+    store = _require_store()
+    cfg = store.job(job_id)
+    if cfg is None: raise HTTPException(status_code=404, detail="job not found")
+    out = store.ranked(job_id, offset=offset, limit=limit)
+    return JSONResponse(content=jsonable_encoder({"id": job_id, "cfg": cfg, "results": _records(out)}))
+
+# ---------------- background batches ----------------
+def _require_batches():
+    if BATCHES is None:
+        raise HTTPException(status_code=503, detail="batch queue disabled (BATCH_DB_PATH is empty)")
+    return BATCHES
+
+@app.post("/batches", status_code=202)
+async def submit_batch(
+    files: List[UploadFile] = File(..., description="One or more PDFs"),
+    owner: str = Form("", description="who submitted the batch; batches from different owners share the CPU fairly"),
+    degree: str = Form(""),
+    req: str = Form(""),
+    nice: str = Form(""),
+    soft_req: str = Form(""),
+    soft_nice: str = Form(""),
+    langs: str = Form(""),
+    min_years: float = Form(0.0),
+    notes: str = Form(""),
+    weights: str = Form("", description='JSON overriding score weights, e.g. {"req_hard": 0.5}'),
+    match: str = Form("exact", description='"semantic" also matches close skills via SKILL_VECTORS_PATH')
+):
+    queue = _require_batches()
+    # validated before anything is spooled, so a rejected job leaves nothing under BATCH_DIR
+    cfg = _job_cfg(degree, req, nice, soft_req, soft_nice, langs, min_years, notes, weights, match)
+    batch_id, folder = queue.new_dir()
     try:
-        for f in files:
-            with open(os.path.join(tmpdir, f.filename), "wb") as fh:
-                fh.write(await f.read())
-
-        df = run_to_df(tmpdir, "*.pdf")
-        df = _ensure_cols(df).fillna("")               
-        df = clean_df(df).fillna("")
-
-        cfg: Dict[str, Any] = dict(
-            degree=degree, req=req, nice=nice, soft_req=soft_req,
-            soft_nice=soft_nice, langs=langs, min_years=min_years, notes=notes
-        )
-        out = score_df(df, cfg).reset_index(drop=True)
-        out = out.where(pd.notnull(out), None)       
-        payload = {
-            "count": int(len(out)),
-            "top5": out.head(5).to_dict(orient="records"),
-            "results": out.to_dict(orient="records"),
-        }
-        return JSONResponse(content=jsonable_encoder(payload))
-    finally:
-        shutil.rmtree(tmpdir, ignore_errors=True)
\ No newline at end of file
+        with timed("upload"): uploads = await spool_uploads(files, folder)
+    except BaseException:
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    return queue.submit(batch_id, owner.strip(), cfg, uploads)
+
+@app.get("/batches")
+def list_batches(owner: str | None = None):
+    return {"results": _require_batches().batches(owner)}
+
+@app.get("/batches/{batch_id}")
+def get_batch(batch_id: str):
+    batch = _require_batches().get(batch_id)
+    if batch is None: raise HTTPException(status_code=404, detail="batch not found")
+    return batch
+
+@app.get("/batches/{batch_id}/results")
+def batch_results(batch_id: str, offset: int = 0, limit: int = 50):
+    queue = _require_batches()
+    batch = queue.get(batch_id)
+    if batch is None: raise HTTPException(status_code=404, detail="batch not found")
+    if batch["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"batch is {batch['status']}")
+    return {"id": batch_id, "count": batch["parsed"] - batch["duplicates"], "offset": offset,
+            "results": queue.results(batch_id, offset, limit), "errors": queue.errors(batch_id),
+            "duplicates": queue.duplicates(batch_id)}
+
+@app.delete("/batches/{batch_id}")
+def delete_batch(batch_id: str):
+    if not _require_batches().cancel(batch_id):
+        raise HTTPException(status_code=404, detail="batch not found")
+    return {"deleted": batch_id}
@@ -0,0 +1,246 @@
+import json, os, shutil, sqlite3, threading, time, uuid
+import pandas as pd
+
+import metrics
+from dedup import find_duplicates
+from metrics import timed
+from profile_ingest_pdf import iter_parse, rows_to_df, INGEST_WORKERS, INGEST_TIMEOUT
+from quick_clean import clean_df
+from scorer import score_df
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS") or 2)
+BATCH_CHUNK = int(os.getenv("BATCH_CHUNK") or max(2 * INGEST_WORKERS, 8))
+
+class BatchQueue:
+    """SQLite-backed queue of scoring batches, run by a few local worker threads.
+
+    Uploaded PDFs live under `spool_dir/<batch id>/` and every parsed row is written as
+    soon as it is ready, so after a restart interrupted batches resume where they stopped.
+    At most `workers` batches run at once; the next one goes to the owner with the fewest
+    running batches, then the one served least recently. Running batches parse in chunks
+    of `chunk` files, so they take turns on the shared ingest pool.
+    """
+
+    def __init__(self, path: str, spool_dir: str, cache=None,
+                 workers: int = BATCH_WORKERS, chunk: int = BATCH_CHUNK):
+        self.path, self.spool_dir, self.cache = path, spool_dir, cache
+        self.workers, self.chunk = max(int(workers), 1), max(int(chunk), 1)
+        os.makedirs(spool_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: list = []
+        self._served: dict = {}   # owner -> last time one of its batches started
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS batches (
+                id TEXT PRIMARY KEY, owner TEXT NOT NULL, cfg TEXT NOT NULL, status TEXT NOT NULL,
+                total INTEGER NOT NULL, error TEXT NOT NULL DEFAULT '',
+                created REAL NOT NULL, started REAL, finished REAL);
+            CREATE INDEX IF NOT EXISTS batches_status ON batches(status, created);
+            CREATE TABLE IF NOT EXISTS batch_files (
+                batch_id TEXT NOT NULL REFERENCES batches(id) ON DELETE CASCADE, idx INTEGER NOT NULL,
+                path TEXT NOT NULL, filename TEXT NOT NULL, sha256 TEXT NOT NULL,
+                row TEXT, error TEXT, duplicate_of INTEGER, PRIMARY KEY (batch_id, idx));
+            CREATE TABLE IF NOT EXISTS batch_results (
+                batch_id TEXT NOT NULL REFERENCES batches(id) ON DELETE CASCADE, rank INTEGER NOT NULL,
+                row TEXT NOT NULL, PRIMARY KEY (batch_id, rank));
+        """)
+        self._db.execute("PRAGMA foreign_keys=ON")
+        if "duplicate_of" not in {r[1] for r in self._db.execute("PRAGMA table_info(batch_files)")}:
+            self._db.execute("ALTER TABLE batch_files ADD COLUMN duplicate_of INTEGER")
+        with self._db:
+            # whatever was running when the process died goes back in line
+            self._db.execute("UPDATE batches SET status = 'queued' WHERE status = 'running'")
+
+    # ---------------- submit / inspect ----------------
+    def new_dir(self) -> tuple[str, str]:
+        batch_id = uuid.uuid4().hex
+        path = os.path.join(self.spool_dir, batch_id)
+        os.makedirs(path)
+        return batch_id, path
+
+    def submit(self, batch_id: str, owner: str, cfg: dict, uploads: list[dict]) -> dict:
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO batches (id, owner, cfg, status, total, created) VALUES (?, ?, ?, 'queued', ?, ?)",
+                             (batch_id, owner, json.dumps(cfg, ensure_ascii=False), len(uploads), time.time()))
+            self._db.executemany(
+                "INSERT INTO batch_files (batch_id, idx, path, filename, sha256) VALUES (?, ?, ?, ?, ?)",
+                [(batch_id, i, u["path"], u["filename"], u["sha256"]) for i, u in enumerate(uploads)])
+        with self._wake:
+            self._wake.notify()
+        return self.get(batch_id)
+
+    def get(self, batch_id: str) -> dict | None:
+        with self._lock:
+            hit = self._db.execute(
+                "SELECT id, owner, cfg, status, total, error, created, started, finished,"
+                " (SELECT COUNT(row) FROM batch_files f WHERE f.batch_id = b.id),"
+                " (SELECT COUNT(error) FROM batch_files f WHERE f.batch_id = b.id),"
+                " (SELECT COUNT(duplicate_of) FROM batch_files f WHERE f.batch_id = b.id)"
+                " FROM batches b WHERE id = ?", (batch_id,)).fetchone()
+        if hit is None: return None
+        bid, owner, cfg, status, total, error, created, started, finished, parsed, failed, dups = hit
+        return {"id": bid, "owner": owner, "cfg": json.loads(cfg), "status": status, "error": error,
+                "total": total, "parsed": parsed, "failed": failed, "duplicates": dups,
+                "progress": round((parsed + failed) / total, 4) if total else 1.0,
+                "created": created, "started": started, "finished": finished}
+
+    def batches(self, owner: str | None = None) -> list[dict]:
+        with self._lock:
+            sql = "SELECT id FROM batches" + (" WHERE owner = ?" if owner is not None else "") + " ORDER BY created"
+            ids = [r[0] for r in self._db.execute(sql, (owner,) if owner is not None else ()).fetchall()]
+        return [b for b in map(self.get, ids) if b is not None]
+
+    def results(self, batch_id: str, offset: int = 0, limit: int | None = None) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT row FROM batch_results WHERE batch_id = ? ORDER BY rank LIMIT ? OFFSET ?",
+                (batch_id, -1 if limit is None else int(limit), int(offset))).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def errors(self, batch_id: str) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT filename, error FROM batch_files WHERE batch_id = ? AND error IS NOT NULL ORDER BY idx",
+                (batch_id,)).fetchall()
+        return [{"file": f, "error": e} for f, e in rows]
+
+    def duplicates(self, batch_id: str) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT f.filename, o.filename FROM batch_files f JOIN batch_files o"
+                " ON o.batch_id = f.batch_id AND o.idx = f.duplicate_of"
+                " WHERE f.batch_id = ? ORDER BY f.idx", (batch_id,)).fetchall()
+        return [{"file": f, "duplicate_of": o} for f, o in rows]
+
+    def cancel(self, batch_id: str) -> bool:
+        """Drop a batch and its files; a running batch stops after its current chunk."""
+        with self._lock, self._db:
+            hit = self._db.execute("SELECT status FROM batches WHERE id = ?", (batch_id,)).fetchone()
+            if hit is None: return False
+            if hit[0] == "running":
+                self._db.execute("UPDATE batches SET status = 'cancelled' WHERE id = ?", (batch_id,))
+                return True
+            self._db.execute("DELETE FROM batches WHERE id = ?", (batch_id,))
+        shutil.rmtree(os.path.join(self.spool_dir, batch_id), ignore_errors=True)
+        return True
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM batches GROUP BY status").fetchall())
+
+    # ---------------- workers ----------------
+    def start(self):
+        if self._threads: return
+        self._stop.clear()
+        for n in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"batch-worker-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def _claim(self) -> str | None:
+        with self._lock, self._db:
+            queued = self._db.execute("SELECT id, owner, created FROM batches WHERE status = 'queued'").fetchall()
+            if not queued: return None
+            running: dict = {}
+            for (owner,) in self._db.execute("SELECT owner FROM batches WHERE status = 'running'"):
+                running[owner] = running.get(owner, 0) + 1
+            batch_id, owner, _ = min(queued, key=lambda r: (running.get(r[1], 0), self._served.get(r[1], 0.0), r[2]))
+            now = time.time()
+            self._served[owner] = now
+            self._db.execute("UPDATE batches SET status = 'running', started = COALESCE(started, ?) WHERE id = ?",
+                             (now, batch_id))
+            return batch_id
+
+    def _loop(self):
+        while not self._stop.is_set():
+            batch_id = self._claim()
+            if batch_id is None:
+                with self._wake:
+                    self._wake.wait(1.0)
+                continue
+            try:
+                self._run(batch_id)
+            except Exception as e:
+                # a failed batch is not retried, so its PDFs are dropped like a finished one's
+                if not self._finish(batch_id, "failed", f"{type(e).__name__}: {e}"):
+                    self.cancel(batch_id)
+                shutil.rmtree(os.path.join(self.spool_dir, batch_id), ignore_errors=True)
+
+    def _status(self, batch_id: str) -> str | None:
+        with self._lock:
+            hit = self._db.execute("SELECT status FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        return hit[0] if hit else None
+
+    def _finish(self, batch_id: str, status: str, error: str = "") -> bool:
+        """Move a running batch to `status`; False if it was cancelled meanwhile."""
+        with self._lock, self._db:
+            return self._db.execute("UPDATE batches SET status = ?, error = ?, finished = ? WHERE id = ?"
+                                    " AND status = 'running'", (status, error, time.time(), batch_id)).rowcount > 0
+
+    def _run(self, batch_id: str):
+        with self._lock:
+            cfg = json.loads(self._db.execute("SELECT cfg FROM batches WHERE id = ?", (batch_id,)).fetchone()[0])
+            todo = self._db.execute(
+                "SELECT idx, path, sha256 FROM batch_files WHERE batch_id = ? AND row IS NULL AND error IS NULL"
+                " ORDER BY idx", (batch_id,)).fetchall()
+        for start in range(0, len(todo), self.chunk):
+            if self._stop.is_set(): return   # stays 'running' in the db, re-queued on next start
+            if self._status(batch_id) != "running":
+                self.cancel(batch_id)
+                return
+            part = todo[start:start + self.chunk]
+            done = []
+            for i, row, err in iter_parse([p for _, p, _ in part], INGEST_WORKERS, INGEST_TIMEOUT,
+                                          cache=self.cache, digests=[d for _, _, d in part]):
+                done.append((json.dumps(row, ensure_ascii=False) if row is not None else None,
+                             err["error"] if err is not None else None, batch_id, part[i][0]))
+            with self._lock, self._db:
+                self._db.executemany("UPDATE batch_files SET row = ?, error = ? WHERE batch_id = ? AND idx = ?", done)
+
+        if self._status(batch_id) != "running":
+            self.cancel(batch_id)
+            return
+        with self._lock:
+            found = [(i, json.loads(r)) for i, r in self._db.execute(
+                "SELECT idx, row FROM batch_files WHERE batch_id = ? AND row IS NOT NULL ORDER BY idx", (batch_id,))]
+        # the same person uploaded twice is ranked once, under its first file
+        dups = [(found[a][0], found[b][0]) for a, b, _, _ in find_duplicates([r for _, r in found])]
+        if dups:
+            metrics.PDFS.inc(len(dups), outcome="duplicate")
+            with self._lock, self._db:
+                self._db.executemany("UPDATE batch_files SET duplicate_of = ? WHERE batch_id = ? AND idx = ?",
+                                     [(b, batch_id, a) for a, b in dups])
+        drop = {a for a, _ in dups}
+        df = rows_to_df([r for i, r in found if i not in drop]).fillna("")
+        with timed("clean_df"): df = clean_df(df).fillna("")
+        with timed("score_df"): out = score_df(df, cfg).reset_index(drop=True)
+        out = out.where(pd.notnull(out), None)
+        with self._lock, self._db:
+            # same transaction as the results, so a cancel that lands mid-run is never overwritten
+            done = self._db.execute("UPDATE batches SET status = 'done', finished = ? WHERE id = ? AND status = 'running'",
+                                    (time.time(), batch_id)).rowcount > 0
+            if done:
+                self._db.execute("DELETE FROM batch_results WHERE batch_id = ?", (batch_id,))
+                self._db.executemany("INSERT INTO batch_results (batch_id, rank, row) VALUES (?, ?, ?)",
+                                     [(batch_id, r, json.dumps(rec, ensure_ascii=False, default=str))
+                                      for r, rec in enumerate(out.to_dict(orient="records"))])
+        if not done:
+            self.cancel(batch_id)
+            return
+        # the PDFs are no longer needed once every row is stored
+        shutil.rmtree(os.path.join(self.spool_dir, batch_id), ignore_errors=True)
+
+def queue_from_env(cache=None) -> BatchQueue | None:
+    path = os.getenv("BATCH_DB_PATH", "batches.sqlite3")
+    return BatchQueue(path, os.getenv("BATCH_DIR", "batch_uploads"), cache) if path else None
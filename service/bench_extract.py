@@ -0,0 +1,51 @@
+"""Compare PDF text modes against full extraction: per-field accuracy and per-PDF latency.
+
+    python bench_extract.py [--dir pdfs] [--pages 2 3 6] [--repeat 3]
+"""
+import argparse, glob, os, statistics, time
+
+import profile_ingest_pdf as P
+
+def _run(paths, mode, max_pages, repeat):
+    rows, times = {}, []
+    for p in paths:
+        best = None
+        for _ in range(repeat):
+            t = time.perf_counter()
+            raw = P.pdf_text(p, mode, max_pages)
+            best = min(best or 1e9, time.perf_counter() - t)
+        rows[p] = P.parse_text(raw, p)
+        times.append(best)
+    return rows, times
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdfs"))
+    ap.add_argument("--pages", type=int, nargs="*", default=[2, 3, P.PDF_MAX_PAGES],
+                    help="page caps to try for the fast mode")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "*.pdf")))
+    if not paths: raise SystemExit(f"no PDFs in {args.dir}")
+    ref, ref_times = _run(paths, "full", None, args.repeat)
+    fields = list(ref[paths[0]].keys())
+
+    runs = [("full", None)] + [("fast", n) for n in args.pages]
+    if P.HAS_PDFIUM: runs.append(("pdfium", None))
+    else: print("(pypdfium2 not installed: skipping pdfium)")
+
+    print(f"{len(paths)} PDFs; accuracy = fields equal to full extraction\n")
+    print(f"{'mode':<10} {'median ms':>9} {'mean ms':>8} {'speedup':>7}  {'all fields':>10}  per field")
+    for mode, pages in runs:
+        rows, times = (ref, ref_times) if mode == "full" else _run(paths, mode, pages, args.repeat)
+        label = f"{mode}/{pages}" if pages else mode
+        per_field = {f: sum(rows[p][f] == ref[p][f] for p in paths) for f in fields}
+        exact = sum(all(rows[p][f] == ref[p][f] for f in fields) for p in paths)
+        speed = statistics.mean(ref_times) / statistics.mean(times)
+        print(f"{label:<10} {statistics.median(times)*1000:9.1f} {statistics.mean(times)*1000:8.1f} "
+              f"{speed:6.1f}x  {exact:>4}/{len(paths):<5}  "
+              + " ".join(f"{f}={n}" for f, n in per_field.items() if n < len(paths)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark service cold start: import time, warm-up time and first-request latency.
+
+    python bench_startup.py                        # WARMUP=0 and WARMUP=1, 3 fresh processes each
+    python bench_startup.py --workers 4 --files 8 --repeat 5
+
+Every run is a new interpreter that imports api, starts the app (lifespan included) and
+posts the same PDFs to /score/pdfs twice; with WARMUP=1 it first waits for the warm-up to
+finish, as a readiness probe would. The parse cache, candidate store and batch queue are
+disabled so every request really parses. Reports the median over --repeat runs.
+"""
+import argparse, glob, json, os, statistics, subprocess, sys, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def child(args):
+    t0 = time.perf_counter()
+    import pandas
+    t1 = time.perf_counter()
+    import fastapi
+    t2 = time.perf_counter()
+    import api
+    t3 = time.perf_counter()
+    from fastapi.testclient import TestClient
+    import warmup
+
+    paths = sorted(glob.glob(os.path.join(args.pdfs, "*.pdf")))[:args.files]
+    files = [("files", (os.path.basename(p), open(p, "rb").read(), "application/pdf")) for p in paths]
+    out = {"import_pandas": t1 - t0, "import_fastapi": t2 - t1, "import_api": t3 - t2, "import_total": t3 - t0}
+    with TestClient(api.app) as client:
+        t = time.perf_counter()
+        while warmup.status()["status"] == "warming": time.sleep(0.005)
+        out["warmup_wait"] = time.perf_counter() - t
+        for name in ("first_request", "second_request"):
+            t = time.perf_counter()
+            r = client.post("/score/pdfs", files=files, data={"req": "python"})
+            out[name] = time.perf_counter() - t
+            if r.status_code != 200: raise SystemExit(f"{name}: HTTP {r.status_code} {r.text[:200]}")
+        out["warmup"] = warmup.status()["status"]
+    out["ready_to_first_response"] = out["import_total"] + out["warmup_wait"] + out["first_request"]
+    print(json.dumps(out))
+
+def run_once(args, warm: bool) -> dict:
+    env = dict(os.environ, WARMUP="1" if warm else "0", PARSE_CACHE_PATH="", CANDIDATE_DB_PATH="", BATCH_DB_PATH="")
+    if args.workers: env["INGEST_WORKERS"] = str(args.workers)
+    cmd = [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child",
+           "--pdfs", args.pdfs, "--files", str(args.files)]
+    res = subprocess.run(cmd, cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pdfs", default=os.path.join(HERE, "pdfs"))
+    ap.add_argument("--files", type=int, default=4, help="PDFs per request")
+    ap.add_argument("--workers", type=int, help="INGEST_WORKERS for the server (default: its own default)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="bench_startup.json")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child: return child(args)
+
+    results = {}
+    for warm in (False, True):
+        runs = [run_once(args, warm) for _ in range(args.repeat)]
+        key = "warm" if warm else "cold"
+        results[key] = {k: round(statistics.median(r[k] for r in runs), 4)
+                        for k, v in runs[0].items() if isinstance(v, float)}
+        results[key]["warmup"] = runs[-1]["warmup"]
+
+    stages = list(results["cold"])
+    print(f"{'':24}{'WARMUP=0':>10}{'WARMUP=1':>10}")
+    for s in stages:
+        if s == "warmup": continue
+        print(f"{s:24}{results['cold'][s]:>10.4f}{results['warm'][s]:>10.4f}")
+    doc = {"meta": {"python": sys.version.split()[0], "cpus": os.cpu_count(), "files": args.files,
+                    "workers": args.workers, "repeat": args.repeat, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+           "results": results}
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, indent=2)
+    print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import hashlib, json, os, sqlite3, threading, time
+import numpy as np
+import pandas as pd
+
+from profile_ingest_pdf import COLUMNS
+from scorer import TOKENS_COL, text_tokens
+from dedup import DedupIndex, signature
+
+def candidate_key(row: dict) -> str:
+    # same person re-uploaded (new export, new file name) maps to the same candidate
+    url, email = str(row.get("url") or "").strip().lower(), str(row.get("email") or "").strip().lower()
+    if url: return f"url:{url.rstrip('/')}"
+    if email: return f"email:{email}"
+    return "text:" + hashlib.sha256(str(row.get("profile_text") or "").encode("utf-8")).hexdigest()
+
+def _text(v) -> str:
+    return v if isinstance(v, str) else ("" if v is None else str(v))
+
+class CandidateStore:
+    """SQLite repository of cleaned candidate rows, job configs and per-job scores.
+
+    Each candidate also keeps its profile_text tokens, computed once on write, so
+    re-scoring never re-tokenizes the text, and a MinHash signature: an upload whose
+    key is new but whose email, URL or profile text matches a stored candidate
+    updates that candidate instead of adding a second one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        cols = ", ".join(f'"{c}" TEXT NOT NULL DEFAULT \'\'' for c in COLUMNS)
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, {cols},
+                {TOKENS_COL} TEXT NOT NULL DEFAULT '', sig BLOB, created REAL NOT NULL, updated REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, cfg TEXT NOT NULL, created REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS scores (
+                job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+                score REAL NOT NULL, motivo TEXT NOT NULL,
+                PRIMARY KEY (job_id, candidate_id));
+            CREATE INDEX IF NOT EXISTS scores_rank ON scores(job_id, score DESC);
+        """)
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._backfill()
+        self.dedup = DedupIndex()
+        for cid, url, email, sig in self._db.execute("SELECT id, url, email, sig FROM candidates"):
+            self.dedup.add(cid, {"url": url, "email": email},
+                           np.frombuffer(sig, dtype=np.uint32) if sig else None)
+
+    def _backfill(self):
+        # databases created before the tokens / sig columns get them filled in once
+        have = {r[1] for r in self._db.execute("PRAGMA table_info(candidates)")}
+        with self._db:
+            if TOKENS_COL not in have:
+                self._db.execute(f"ALTER TABLE candidates ADD COLUMN {TOKENS_COL} TEXT NOT NULL DEFAULT ''")
+            if "sig" not in have:
+                self._db.execute("ALTER TABLE candidates ADD COLUMN sig BLOB")
+            todo = self._db.execute(
+                f"SELECT id, profile_text FROM candidates WHERE {TOKENS_COL} = '' AND profile_text != ''").fetchall()
+            self._db.executemany(f"UPDATE candidates SET {TOKENS_COL} = ? WHERE id = ?",
+                                 [(text_tokens(t), i) for i, t in todo])
+            todo = self._db.execute("SELECT id, profile_text FROM candidates WHERE sig IS NULL AND profile_text != ''").fetchall()
+            self._db.executemany("UPDATE candidates SET sig = ? WHERE id = ?",
+                                 [(signature(t).tobytes(), i) for i, t in todo])
+
+    # ---------------- candidates ----------------
+    def upsert(self, df: pd.DataFrame) -> dict:
+        """Insert new candidates, update changed ones; returns ids by outcome.
+
+        `merged` lists {"id", "match", "similarity"} for rows matched to an existing
+        candidate by email, URL or MinHash rather than by key; they also appear in
+        `updated` / `unchanged`.
+        """
+        out = {"added": [], "updated": [], "unchanged": [], "merged": []}
+        now = time.time()
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        quoted = ", ".join(f'"{c}"' for c in COLUMNS)
+        with self._lock, self._db:
+            for row in df.to_dict(orient="records"):
+                vals = [_text(row.get(c)) for c in COLUMNS]
+                key = candidate_key(row)
+                sig = signature(row.get("profile_text"))
+                blob = sig.tobytes() if sig is not None else None
+                hit = self._db.execute(f"SELECT id, {quoted} FROM candidates WHERE key = ?", (key,)).fetchone()
+                if hit is None:
+                    dup = self.dedup.match(row, sig)
+                    if dup is not None:
+                        hit = self._db.execute(f"SELECT id, {quoted} FROM candidates WHERE id = ?", (dup[0],)).fetchone()
+                        out["merged"].append({"id": dup[0], "match": dup[1], "similarity": dup[2]})
+                        # fields the new export left empty keep their stored values
+                        vals = [v or old for v, old in zip(vals, hit[1:])]
+                        row = dict(zip(COLUMNS, vals))
+                if hit is None:
+                    cur = self._db.execute(
+                        f"INSERT INTO candidates (key, {quoted}, {TOKENS_COL}, sig, created, updated)"
+                        f" VALUES (?, {placeholders}, ?, ?, ?, ?)",
+                        (key, *vals, text_tokens(row.get("profile_text")), blob, now, now))
+                    out["added"].append(cur.lastrowid)
+                    self.dedup.add(cur.lastrowid, row, sig)
+                elif list(hit[1:]) != vals:
+                    sets = ", ".join(f'"{c}" = ?' for c in COLUMNS)
+                    self._db.execute(f"UPDATE candidates SET {sets}, {TOKENS_COL} = ?, sig = ?, updated = ? WHERE id = ?",
+                                     (*vals, text_tokens(row.get("profile_text")), blob, now, hit[0]))
+                    out["updated"].append(hit[0])
+                    self.dedup.add(hit[0], row, sig)
+                else:
+                    out["unchanged"].append(hit[0])
+        return out
+
+    def candidates(self, ids=None, offset: int = 0, limit: int | None = None, columns=None,
+                   tokens: bool = False) -> pd.DataFrame:
+        """Candidate rows with an `id` column; `tokens=True` adds the stored tokens for score_df."""
+        columns = [c for c in (columns or COLUMNS) if c in COLUMNS] + ([TOKENS_COL] if tokens else [])
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        sql = f"SELECT id, {quoted} FROM candidates"
+        if ids is None:
+            with self._lock:
+                rows = self._db.execute(sql + " ORDER BY id LIMIT ? OFFSET ?",
+                                        (-1 if limit is None else int(limit), int(offset))).fetchall()
+            return pd.DataFrame(rows, columns=["id", *columns])
+        ids, rows = [int(i) for i in ids], []
+        with self._lock:
+            # stay under SQLite's bound-parameter limit
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                rows += self._db.execute(f"{sql} WHERE id IN ({', '.join('?' for _ in chunk)}) ORDER BY id",
+                                         chunk).fetchall()
+        return pd.DataFrame(rows, columns=["id", *columns])
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def delete(self, candidate_id: int) -> bool:
+        with self._lock, self._db:
+            self.dedup.remove(int(candidate_id))
+            return self._db.execute("DELETE FROM candidates WHERE id = ?", (int(candidate_id),)).rowcount > 0
+
+    # ---------------- jobs / scores ----------------
+    def add_job(self, cfg: dict) -> int:
+        with self._lock, self._db:
+            return self._db.execute("INSERT INTO jobs (cfg, created) VALUES (?, ?)",
+                                    (json.dumps(cfg, ensure_ascii=False), time.time())).lastrowid
+
+    def job(self, job_id: int) -> dict | None:
+        with self._lock:
+            hit = self._db.execute("SELECT cfg FROM jobs WHERE id = ?", (int(job_id),)).fetchone()
+        return json.loads(hit[0]) if hit else None
+
+    def jobs(self) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute("SELECT id, cfg, created FROM jobs ORDER BY id").fetchall()
+        return [{"id": i, "cfg": json.loads(c), "created": t} for i, c, t in rows]
+
+    def delete_job(self, job_id: int) -> bool:
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM jobs WHERE id = ?", (int(job_id),)).rowcount > 0
+
+    def save_scores(self, job_id: int, scored: pd.DataFrame):
+        """scored: score_df output with an `id` column."""
+        rows = [(int(job_id), int(i), float(s), str(m))
+                for i, s, m in zip(scored["id"], scored["score"], scored["motivo"])]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (job_id, candidate_id, score, motivo) VALUES (?, ?, ?, ?)", rows)
+
+    def ranked(self, job_id: int, offset: int = 0, limit: int | None = None) -> pd.DataFrame:
+        quoted = ", ".join(f'c."{c}"' for c in COLUMNS)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT c.id, {quoted}, s.score, s.motivo FROM scores s JOIN candidates c ON c.id = s.candidate_id"
+                " WHERE s.job_id = ? ORDER BY s.score DESC, c.id LIMIT ? OFFSET ?",
+                (int(job_id), -1 if limit is None else int(limit), int(offset))).fetchall()
+        return pd.DataFrame(rows, columns=["id", *COLUMNS, "score", "motivo"])
+
+def store_from_env() -> CandidateStore | None:
+    path = os.getenv("CANDIDATE_DB_PATH", "candidates.sqlite3")
+    return CandidateStore(path) if path else None
@@ -0,0 +1,113 @@
+"""Duplicate candidate detection: exact email / LinkedIn URL keys plus MinHash LSH over profile_text.
+
+Each profile becomes a NUM_PERM-value MinHash signature of its word shingles. Signatures
+are split into BANDS bands, and profiles sharing any band land in the same bucket, so a
+lookup only compares against the few profiles in its buckets, never the whole pool.
+Bucket hits count as duplicates when their estimated Jaccard similarity reaches the threshold.
+"""
+import os, threading, zlib
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16                 # 4 rows per band: pairs above ~0.5 similarity usually share a bucket
+SHINGLE = 5                # words per shingle
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD") or 0.85)
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)   # fixed: signatures are stored, so they must not change between runs
+_A = _rng.randint(1, _PRIME, NUM_PERM).astype(np.uint64)[:, None]
+_B = _rng.randint(0, _PRIME, NUM_PERM).astype(np.uint64)[:, None]
+
+def exact_keys(row: dict) -> list[str]:
+    # same normalization as candidate_store.candidate_key
+    url, email = str(row.get("url") or "").strip().lower(), str(row.get("email") or "").strip().lower()
+    return ([f"url:{url.rstrip('/')}"] if url else []) + ([f"email:{email}"] if email else [])
+
+def signature(text: str) -> np.ndarray | None:
+    """MinHash of the text's word shingles (uint32[NUM_PERM]); None for empty text."""
+    words = str(text or "").lower().split()
+    if not words: return None
+    grams = {" ".join(words[i:i + SHINGLE]) for i in range(max(len(words) - SHINGLE + 1, 1))}
+    h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    # a < 2^31 and h < 2^32, so a*h + b stays below 2^64
+    return ((_A * h + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+def _bands(sig: np.ndarray) -> list[bytes]:
+    return [bytes([b]) + chunk.tobytes() for b, chunk in enumerate(np.split(sig, BANDS))]
+
+class DedupIndex:
+    """Exact keys and LSH buckets -> ids of the profiles already seen."""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD):
+        self.threshold = float(threshold)
+        self._keys: dict = {}      # exact key -> id
+        self._buckets: dict = {}   # band -> set of ids
+        self._docs: dict = {}      # id -> (exact keys, signature)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, row: dict, sig: np.ndarray | None = None):
+        sig = signature(row.get("profile_text")) if sig is None else sig
+        keys = exact_keys(row)
+        with self._lock:
+            self._remove(doc_id)
+            for k in keys:
+                self._keys.setdefault(k, doc_id)
+            if sig is not None:
+                for band in _bands(sig):
+                    self._buckets.setdefault(band, set()).add(doc_id)
+            self._docs[doc_id] = (keys, sig)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None: return
+        keys, sig = doc
+        for k in keys:
+            if self._keys.get(k) == doc_id: del self._keys[k]
+        if sig is not None:
+            for band in _bands(sig):
+                ids = self._buckets.get(band)
+                if ids is None: continue
+                ids.discard(doc_id)
+                if not ids: del self._buckets[band]
+
+    def match(self, row: dict, sig: np.ndarray | None = None):
+        """(id, how, similarity) of a stored duplicate of row, or None.
+
+        `how` is "url" or "email" for exact key hits, otherwise "minhash".
+        """
+        with self._lock:
+            for k in exact_keys(row):
+                if k in self._keys: return self._keys[k], k.split(":", 1)[0], 1.0
+        sig = signature(row.get("profile_text")) if sig is None else sig
+        if sig is None: return None
+        with self._lock:
+            seen = set()
+            for band in _bands(sig):
+                seen.update(self._buckets.get(band, ()))
+            best = max(((similarity(sig, self._docs[i][1]), i) for i in seen), default=None, key=lambda t: t[0])
+        if best is None or best[0] < self.threshold: return None
+        return best[1], "minhash", round(best[0], 4)
+
+def find_duplicates(rows, threshold: float = DEDUP_THRESHOLD) -> list[tuple]:
+    """(index, index of the earlier row it duplicates, how, similarity) for each repeat in rows.
+
+    None entries (failed parses) are skipped.
+    """
+    index, out = DedupIndex(threshold), []
+    for i, row in enumerate(rows):
+        if row is None: continue
+        sig = signature(row.get("profile_text"))
+        hit = index.match(row, sig)
+        if hit is None: index.add(i, row, sig)
+        else: out.append((i, *hit))
+    return out
@@ -0,0 +1,53 @@
+"""Response encoders for scored frames: plain JSON records, a compact columnar layout, Arrow IPC.
+
+orjson and pyarrow are optional; without orjson the stdlib json module is used, and the
+Arrow format is unavailable without pyarrow.
+"""
+import json
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+FORMATS = ("records", "columns", "arrow")
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+TEXT_COLUMNS = ("profile_text",)   # left out unless asked for: by far the largest field
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+def _native(col: pd.Series) -> list:
+    # NaN/NaT -> None; numeric columns come out of tolist() as Python floats/ints already
+    values = col.tolist()
+    if col.dtype == object or col.hasnans:
+        values = [None if v is None or v != v else v for v in values]
+    return values
+
+def visible(df: pd.DataFrame, text: bool = False) -> pd.DataFrame:
+    return df if text else df.drop(columns=[c for c in TEXT_COLUMNS if c in df.columns])
+
+def records(df: pd.DataFrame) -> list[dict]:
+    cols = {c: _native(df[c]) for c in df.columns}
+    return [dict(zip(cols, vals)) for vals in zip(*cols.values())] if len(df) else []
+
+def columns(df: pd.DataFrame) -> dict:
+    """{"columns": [...], "data": {column: [values]}}: each field name once instead of once per row."""
+    return {"columns": list(df.columns), "data": {c: _native(df[c]) for c in df.columns}}
+
+def arrow_ipc(df: pd.DataFrame, meta: dict | None = None) -> bytes:
+    """Arrow IPC stream of df; `meta` goes JSON-encoded into the schema metadata."""
+    if pyarrow is None: raise RuntimeError("the arrow format needs pyarrow installed")
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    if meta: table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"meta": dumps(meta)})
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
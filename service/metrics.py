@@ -0,0 +1,198 @@
+"""Process-local counters, gauges and histograms in Prometheus text format, plus stage timers.
+
+`timed(stage)` observes `stage_seconds{stage=...}` and, inside `profiling(profile)`, also adds
+the duration to that request's Profile. Pool workers run in other processes, so they time
+their work under `collect()` and ship the durations back with each row for `record()`.
+"""
+import bisect, contextvars, math, threading, time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _fmt(v: float) -> str:
+    if v == math.inf: return "+Inf"
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values, le: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le: parts.append(f'le="{le}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labels)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time from `fn() -> {label tuple: value}`."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels=(), fn=None):
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self) -> list[str]:
+        if self.fn is not None:
+            items = sorted((tuple(map(str, k)), v) for k, v in self.fn().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [per-bucket counts, sum, count]
+            v = self._values.get(key)
+            if v is None: v = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets): v[0][i] += 1
+            v[1] += value
+            v[2] += 1
+
+    def render(self) -> list[str]:
+        out = self.header()
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._values.items())
+        for key, (counts, total, n) in items:
+            acc = 0
+            for le, c in zip(self.buckets, counts):
+                acc += c
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, key, _fmt(le))} {acc}")
+            out.append(f"{self.name}_bucket{_labels(self.labelnames, key, '+Inf')} {n}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return out
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict = {}
+
+    def add(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for m in self.metrics.values() for line in m.render()) + "\n"
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_SECONDS = REGISTRY.add(Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")))
+STAGE_SECONDS = REGISTRY.add(Histogram(
+    "pipeline_stage_duration_seconds", "Time spent per pipeline stage (per file for parse/extract stages).", ("stage",)))
+PDFS = REGISTRY.add(Counter(
+    "pdfs_processed_total", "PDFs handled by the ingest pipeline.", ("outcome",)))
+
+# ---------------- request profiles ----------------
+class Profile:
+    """Stage timings for a single request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: dict = {}
+        self.files: list = []
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            s = self.stages.setdefault(stage, [0, 0.0])
+            s[0] += 1
+            s[1] += seconds
+
+    def report(self) -> dict:
+        with self._lock:
+            stages = {k: {"count": n, "seconds": round(t, 6)} for k, (n, t) in self.stages.items()}
+            files = list(self.files)
+        return {"total_seconds": round(time.perf_counter() - self.start, 6), "stages": stages, "files": files}
+
+_PROFILE: contextvars.ContextVar = contextvars.ContextVar("profile", default=None)
+_COLLECT: contextvars.ContextVar = contextvars.ContextVar("collect", default=None)
+
+@contextmanager
+def profiling(profile: Profile | None):
+    token = _PROFILE.set(profile)
+    try:
+        yield profile
+    finally:
+        _PROFILE.reset(token)
+
+def current_profile() -> Profile | None:
+    return _PROFILE.get()
+
+@contextmanager
+def collect():
+    """Gather (stage, seconds) pairs timed in this context, e.g. inside a pool worker."""
+    out: list = []
+    token = _COLLECT.set(out)
+    try:
+        yield out
+    finally:
+        _COLLECT.reset(token)
+
+def observe(stage: str, seconds: float):
+    sink = _COLLECT.get()
+    if sink is not None:
+        sink.append((stage, seconds))
+        return
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    prof = _PROFILE.get()
+    if prof is not None: prof.add(stage, seconds)
+
+def record(stages):
+    """Replay timings collected in another process."""
+    for stage, seconds in stages or ():
+        observe(stage, seconds)
+
+@contextmanager
+def timed(stage: str):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - t)
@@ -0,0 +1,84 @@
+import hashlib, json, os, sqlite3, threading, time
+
+def file_sha256(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class ParseCache:
+    """SQLite store of parse_pdf rows keyed by sha256(pdf bytes) + extractor version, LRU-evicted by size."""
+
+    def __init__(self, path: str, max_bytes: int = 256 << 20, version: str = ""):
+        self.path, self.max_bytes, self.version = path, int(max_bytes), str(version)
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            " key TEXT PRIMARY KEY, row TEXT NOT NULL, size INTEGER NOT NULL, atime REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS parsed_atime ON parsed(atime)")
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM parsed").fetchone()[0]
+        self._evict()
+
+    def _key(self, digest: str) -> str:
+        return f"{digest}:{self.version}"
+
+    def get(self, digest: str) -> dict | None:
+        key = self._key(digest)
+        with self._lock:
+            hit = self._db.execute("SELECT row FROM parsed WHERE key = ?", (key,)).fetchone()
+            if hit is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE parsed SET atime = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(hit[0])
+
+    def put(self, digest: str, row: dict):
+        blob = json.dumps(row, ensure_ascii=False)
+        size = len(blob.encode("utf-8"))
+        if size > self.max_bytes: return
+        key = self._key(digest)
+        with self._lock:
+            old = self._db.execute("SELECT size FROM parsed WHERE key = ?", (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO parsed (key, row, size, atime) VALUES (?, ?, ?, ?)",
+                             (key, blob, size, time.time()))
+            self._bytes += size - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes:
+            victims = self._db.execute("SELECT key, size FROM parsed ORDER BY atime LIMIT 64").fetchall()
+            if not victims: break
+            for key, size in victims:
+                self._db.execute("DELETE FROM parsed WHERE key = ?", (key,))
+                self._bytes -= size
+                self.evictions += 1
+                if self._bytes <= self.max_bytes: break
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM parsed")
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+def cache_from_env(version: str) -> ParseCache | None:
+    path = os.getenv("PARSE_CACHE_PATH", "parse_cache.sqlite3")
+    if not path: return None
+    return ParseCache(path, int(float(os.getenv("PARSE_CACHE_MAX_MB") or 256) * (1 << 20)), version)
@@ -1,6 +1,46 @@
 import re, os, glob
+from concurrent.futures import CancelledError, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import importlib.util, io, multiprocessing, signal, threading, warnings
 import pandas as pd
-from pdfminer.high_level import extract_text
+
+import metrics
+from metrics import timed
+from dedup import find_duplicates
+from parse_cache import file_sha256
+from skill_matcher import build_skill_matcher, load_vocab
+
+# bump whenever an extractor changes its output, so cached rows are re-parsed
+EXTRACTOR_VERSION = "1"
+
+# ---------------- text extraction modes ----------------
+# full:   pdfminer extract_text over every page (reference output)
+# fast:   pdfminer page by page, stopping once contact/experience/education were all seen
+#         or after PDF_MAX_PAGES pages
+# pdfium: pypdfium2 text layer (optional dependency); much faster, reads some columns in a
+#         different order
+# The PDF libraries are imported on first use (load_pdf_backend), so processes that only
+# score or serve stored candidates never pay for them.
+PDF_TEXT_MODES = ("full", "fast", "pdfium")
+PDF_TEXT_MODE = (os.getenv("PDF_TEXT_MODE") or "full").lower()
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES") or 6)
+if PDF_TEXT_MODE not in PDF_TEXT_MODES:
+    raise ValueError(f"PDF_TEXT_MODE must be one of {PDF_TEXT_MODES}")
+HAS_PDFIUM = importlib.util.find_spec("pypdfium2") is not None
+if PDF_TEXT_MODE == "pdfium" and not HAS_PDFIUM:
+    warnings.warn("PDF_TEXT_MODE=pdfium needs pypdfium2; falling back to fast")
+    PDF_TEXT_MODE = "fast"
+if PDF_TEXT_MODE != "full":
+    EXTRACTOR_VERSION = f"{EXTRACTOR_VERSION}+{PDF_TEXT_MODE}" + (f".p{PDF_MAX_PAGES}" if PDF_TEXT_MODE == "fast" else "")
+
+COLUMNS = ["name","age","phone","email","address","degree","years_experience",
+           "skills","soft_skills","languages","profile_text","url"]
+
+# ---------------- ingest pool ----------------
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS") or os.cpu_count() or 1)
+INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT") or 60)
+# the pool is reset when no file finishes for this long, even with INGEST_TIMEOUT=0
+INGEST_STALL = float(os.getenv("INGEST_STALL") or 600)
 
 # ---------------- vocab ----------------
 HARD_SKILLS = [
@@ -29,6 +69,17 @@ SOFT_SKILLS = [
     "organização","resiliência",
 ]
 
+# optional external vocabulary (JSON: {"hard": [...], "soft": [...], "aliases": {alias: canonical}})
+SKILL_ALIASES: dict = {}
+if os.getenv("SKILLS_VOCAB_PATH"):
+    _vocab = load_vocab(os.environ["SKILLS_VOCAB_PATH"])
+    HARD_SKILLS = [s for s in (_vocab["hard"] or HARD_SKILLS) if len(s) > 1]
+    SOFT_SKILLS = _vocab["soft"] or SOFT_SKILLS
+    SKILL_ALIASES = _vocab["aliases"]
+    EXTRACTOR_VERSION = f"{EXTRACTOR_VERSION}+vocab.{_vocab['digest']}"
+
+SKILL_MATCHER = build_skill_matcher(HARD_SKILLS, SOFT_SKILLS, SKILL_ALIASES)
+
 LANG_MAP = {
     "english":"english","inglês":"english","ingles":"english",
     "portuguese":"portuguese","português":"portuguese","portugues":"portuguese",
@@ -57,7 +108,8 @@ COUNTRIES = [
     "brazil","brasil","portugal","spain","españa","argentina","chile","uruguay","paraguay",
     "bolivia","peru","colombia","mexico","united states","usa","canada","germany","france","italy",
 ]
-COUNTRY_RE = re.compile(r"\b(" + "|".join(COUNTRIES) + r")\b", re.I)
+# only the address fallback needs it; left as a string so re compiles it on first use
+COUNTRY_PAT = r"\b(" + "|".join(COUNTRIES) + r")\b"
 
 # ---------------- regex ----------------
 EMAIL_RE = re.compile(r"[A-Z0-9._%+\-]+@[A-Z0-9.\-]+\.[A-Z]{2,}", re.I)
@@ -75,8 +127,35 @@ YEARS_SIMPLE_RE = re.compile(r"(\d{1,2})(?:[.,](\d))?\s*(?:years?|anos?)", re.I)
 
 SECTION_STOP = re.compile(r"^(experience|experiência|education|formação|about|summary|resumo)\b", re.I)
 NAME_LINE_RE = re.compile(r"^[A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][A-Za-zÀ-ÿ'’´`\-]+(?:\s+[A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][A-Za-zÀ-ÿ'’´`\-]+){1,4}$")
-
-LANG_TOKEN_RE = re.compile(r"\b(" + "|".join(map(re.escape, LANG_MAP.keys())) + r")\b", re.I)
+NAME_TITLE_RE = re.compile(
+    r"^([A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][\wÀ-ÿ'’´`\-]+(?:\s+[A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][\wÀ-ÿ'’´`\-]+){1,3})\s+"
+    r"(?:Student|Developer|Engineer|Designer|Software|Estudante|Desenvolvedor|Engenheiro)\b", re.I)
+NAME_ROLE_RE = re.compile(r"(developer|student|engineer|designer)", re.I)
+
+EMAIL_CHAR_RE = re.compile(r"[A-Z0-9._%+\-]", re.I)
+LINKEDIN_IN_RE = re.compile(r"(https?://(?:www\.)?linkedin\.com/in/[^\s)\/]{3,}[^\s)]*)", re.I)
+LINKEDIN_BARE_RE = re.compile(r"((?:www\.)?linkedin\.com/in/[^\s)\/]{3,}[^\s)]*)", re.I)
+DASH_SPACE_RE = re.compile(r"-\s+")
+NON_DIGIT_RE = re.compile(r"\D")
+SPACES_RE = re.compile(r"\s*")
+ADDRESS_RE = re.compile(
+    r"([A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*[A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*(?:Brasil|Brazil|Portugal|Spain|España))", re.I)
+ADDRESS_TAIL_RE = re.compile(r",\s*(?:Brasil|Brazil|Portugal|Spain|España)", re.I)
+ADDRESS_BREAK_RE = re.compile(r"[^\wÀ-ÿ .'-]", re.I)
+ADDRESS_START_RE = re.compile(r"[A-ZÁÂÃÉÍÓÚ]", re.I)
+LANG_BLOCK_RE = re.compile(r"\s*[:\-]?\s*(.+)", re.S)
+DEGREE_BLOCK_RE = re.compile(r"\s*(.+)", re.S)
+DEGREE_SKIP_RE = re.compile(r"(wise up|ingl[eê]s|english course)", re.I)
+DEGREE_WORD_RE = re.compile(r"(bachelor|master|mba|b\.?tech|bacharel|licenciatura|mestrado|doutor)", re.I)
+TOP_SKILLS_END_RE = re.compile(r"experience|education|formação|experiência", re.I)
+TOP_SKILLS_SPLIT_RE = re.compile(r"[,\n•\-\u2022]")
+AGE_RE = re.compile(r"\b(?:idade|age)\s*[:\-]?\s*(\d{1,2})\b", re.I)
+
+# strip_boilerplate
+CONTACT_RE = re.compile(r"conta(?:ct|to)\b", re.I)
+CONTACT_END_RE = re.compile(r"(experience|experiência|education|formação)\b", re.I)
+TOP_SKILLS_LINE_RE = re.compile(r"\btop\s+skills\b", re.I)
+PAGE_FOOTER_RE = re.compile(r"Page\s+\d+\s+of\s+\d+", re.I)
 
 # ---------------- helpers ----------------
 def norm(s: str) -> str:
@@ -89,27 +168,84 @@ def first_match(rex, text, default=""):
     m = rex.search(text)
     return m.group(0) if m else default
 
+# ---------------- sections ----------------
+# the headings some extractors start from. Found once per profile and shared; each
+# spelling gets its own search because the regex engine can only skip ahead quickly
+# on a literal prefix, which an alternation doesn't have.
+SECTION_HEADINGS = {
+    "languages": (re.compile(r"languages", re.I), re.compile(r"idiomas", re.I)),
+    "education": (re.compile(r"education\b", re.I), re.compile(r"formação\b", re.I)),
+    "top_skills": (re.compile(r"top\s+skills", re.I),),
+}
+
+def _find_heading(text: str, name: str):
+    hits = [m for m in (p.search(text) for p in SECTION_HEADINGS[name]) if m]
+    return min(hits, key=lambda m: m.start()).span() if hits else None
+
+def find_sections(text: str) -> dict:
+    """{heading: (start, end)} of the first occurrence of each heading."""
+    return {name: span for name in SECTION_HEADINGS if (span := _find_heading(text, name))}
+
+def _section(text: str, sections: dict | None, name: str):
+    return _find_heading(text, name) if sections is None else sections.get(name)
+
+def _cut(text: str, spans) -> str:
+    out, last = [], 0
+    for s, e in spans:
+        out.append(text[last:s])
+        last = e
+    if not out: return text
+    out.append(text[last:])
+    return "".join(out)
+
+def _email_spans(text: str):
+    # every email match is the whole run of local-part chars before some '@' plus a domain,
+    # so try EMAIL_RE once per '@' instead of at every letter
+    pos = 0
+    while (at := text.find("@", pos)) >= 0:
+        i = at
+        while i > pos and EMAIL_CHAR_RE.match(text, i - 1): i -= 1
+        m = EMAIL_RE.match(text, i) if i < at else None
+        if m:
+            yield m.span()
+            pos = m.end()
+        else:
+            pos = at + 1
+
+def _contact_spans(text: str):
+    pos = 0
+    while (m := CONTACT_RE.search(text, pos)):
+        stop = CONTACT_END_RE.search(text, m.end())
+        if stop is None: return
+        yield m.start(), stop.start()
+        pos = stop.start()
+
+def _top_skills_line_spans(text: str):
+    pos = 0
+    while (m := TOP_SKILLS_LINE_RE.search(text, pos)):
+        end = text.find("\n", m.end())
+        pos = len(text) if end < 0 else end
+        yield m.start(), pos
+
 def extract_email(text: str) -> str:
-    return first_match(EMAIL_RE, text)
+    span = next(_email_spans(text), None)
+    return text[span[0]:span[1]] if span else ""
 
 def extract_linkedin_url(text: str) -> str:
     cleaned = text.replace("\n", " ").replace("\r", " ")
-    cleaned = re.sub(r"-\s+", "-", cleaned)
-    m = re.search(r"(https?://(?:www\.)?linkedin\.com/in/[^\s)\/]{3,}[^\s)]*)", cleaned, re.I)
+    cleaned = DASH_SPACE_RE.sub("-", cleaned)
+    m = LINKEDIN_IN_RE.search(cleaned)
     if m: return m.group(1).rstrip(").,;")
-    m = re.search(r"((?:www\.)?linkedin\.com/in/[^\s)\/]{3,}[^\s)]*)", cleaned, re.I)
+    m = LINKEDIN_BARE_RE.search(cleaned)
     return ("https://" + m.group(1).rstrip(").,;")) if m else ""
 
 def extract_phone(text: str) -> str:
     t = LINKEDIN_URL_RE.sub(" ", text)
-    candidates = []
     for m in PHONE_DIGITS_RE.finditer(t):
-        digits = re.sub(r"\D", "", m.group(0))
-        if 10 <= len(digits) <= 15:
-            candidates.append(digits)
-    if not candidates:
+        d = NON_DIGIT_RE.sub("", m.group(0))
+        if 10 <= len(d) <= 15: break
+    else:
         return ""
-    d = candidates[0]
     if len(d) in (10,11):
         dd, rest = d[:2], d[2:]
         if len(rest) == 9:
@@ -118,14 +254,28 @@ def extract_phone(text: str) -> str:
             return f"+55 ({dd}) {rest[:4]}-{rest[4:]}"
     return d
 
+def _address_match(text: str):
+    # a match is "<X>, <Y>, <country>" with X and Y made only of ADDRESS_RE's run chars, so
+    # it ends at some ", <country>" and starts after the last non-run char before the comma
+    # ahead of it. Searching just that stretch per country avoids re-trying every letter.
+    for tail in ADDRESS_TAIL_RE.finditer(text):
+        c2 = text.rfind(",", 0, tail.start())
+        if c2 < 0: continue
+        pos = text.rfind(",", 0, c2) + 1
+        for b in ADDRESS_BREAK_RE.finditer(text, pos, c2): pos = b.end()
+        # everything after the first part is the same from any start, so only the first
+        # capital that can open it needs trying
+        s = ADDRESS_START_RE.search(text, pos, c2 - 1)
+        m = ADDRESS_RE.match(text, s.start(), tail.end()) if s else None
+        if m: return m
+    return None
+
 def extract_address(text_lines: list[str], full_text: str) -> str:
-    m = re.search(
-        r"([A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*[A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*(?:Brasil|Brazil|Portugal|Spain|España))",
-        full_text, re.I)
+    m = _address_match(full_text)
     if m:
         return ", ".join(p.strip() for p in m.group(1).split(","))
     for l in text_lines:
-        if COUNTRY_RE.search(l) and "," in l and 8 <= len(l) <= 120:
+        if "," in l and 8 <= len(l) <= 120 and re.search(COUNTRY_PAT, l, re.I):
             return ", ".join(p.strip() for p in l.split(","))
     return ""
 
@@ -138,14 +288,11 @@ def canonical_level(raw: str) -> str:
                 return k
     return ""
 
-def extract_languages(text: str) -> dict:
+def extract_languages(text: str, sections: dict | None = None) -> dict:
     langs = {}
-    block = text
-    m = re.search(r"(languages|idiomas)\s*[:\-]?\s*(.+)", text, re.I | re.S)
-    if m:
-        block = m.group(2)
-    toks = block.split()
-    low = [t.lower() for t in toks]
+    sec = _section(text, sections, "languages")
+    m = LANG_BLOCK_RE.match(text, sec[1]) if sec else None
+    low = (m.group(1) if m else text).lower().split()
     for i, tok in enumerate(low):
         if tok not in LANG_MAP: continue
         lang = LANG_MAP[tok]
@@ -158,19 +305,16 @@ def extract_languages(text: str) -> dict:
             langs.setdefault(lang, prev)
     return langs
 
-def extract_degree(full_text: str) -> str:
-    sec = re.search(r"(education|formação)\b\s*(.+)", full_text, re.I | re.S)
-    block = sec.group(2) if sec else full_text
+def extract_degree(full_text: str, sections: dict | None = None) -> str:
+    sec = _section(full_text, sections, "education")
+    m = DEGREE_BLOCK_RE.match(full_text, sec[1]) if sec else None
     best = ""
-    for l in lines(block):
+    for l in lines(m.group(1) if m else full_text):
         if SECTION_STOP.match(l): break
-        if re.search(r"(wise up|ingl[eê]s|english course)", l, re.I): 
-            continue
-        if re.search(r"(bachelor|master|mba|b\.?tech|bacharel|licenciatura|mestrado|doutor)", l, re.I):
-            cand = l.strip()
-            if "page" in cand.lower(): continue
-            if 15 <= len(cand) <= 140 and len(cand) > len(best):
-                best = cand
+        # only a longer line in range can replace `best`, so check that before the regexes
+        if not 15 <= len(l) <= 140 or len(l) <= len(best): continue
+        if DEGREE_SKIP_RE.search(l) or not DEGREE_WORD_RE.search(l) or "page" in l.lower(): continue
+        best = l
     return best
 
 def extract_years(full_text: str) -> str:
@@ -189,26 +333,30 @@ def contains_phrase(text_lc: str, phrase: str) -> bool:
     p = re.escape(phrase.lower()).replace("\\ ", r"\s+")
     return re.search(rf"(?<![A-Za-z0-9#\+]){p}(?![A-Za-z0-9#\+])", text_lc) is not None
 
-def extract_skills(full_text: str):
-    t = full_text.lower()
-    hard = sorted({s for s in HARD_SKILLS if contains_phrase(t, s)})
-    soft = sorted({s for s in SOFT_SKILLS if contains_phrase(t, s)})
-    m = re.search(r"top\s+skills\s*(.+?)(?:experience|education|formação|experiência|\Z)", full_text, re.I | re.S)
-    if m:
-        blob = m.group(1).lower()
-        for token in re.split(r"[,\n•\-\u2022]", blob):
+def extract_skills(full_text: str, sections: dict | None = None):
+    found = SKILL_MATCHER.find(full_text.lower())
+    hard = sorted({s for cat, s in found if cat == "hard"})
+    soft = sorted({s for cat, s in found if cat == "soft"})
+    sec = _section(full_text, sections, "top_skills")
+    # the block runs from after the heading's whitespace to the next section word (at least one char)
+    start = SPACES_RE.match(full_text, sec[1]).end() if sec else len(full_text)
+    if start < len(full_text):
+        stop = TOP_SKILLS_END_RE.search(full_text, start + 1)
+        blob = full_text[start:stop.start() if stop else len(full_text)].lower()
+        for token in TOP_SKILLS_SPLIT_RE.split(blob):
             tok = token.strip()
             if 2 <= len(tok) <= 40:
-                if tok in SOFT_SKILLS and tok not in soft: soft.append(tok)
-                if tok in HARD_SKILLS and tok not in hard: hard.append(tok)
+                for cat, s in SKILL_MATCHER.payloads.get(tok, ()):
+                    if cat == "soft" and s not in soft: soft.append(s)
+                    if cat == "hard" and s not in hard: hard.append(s)
     return sorted(hard), sorted(soft)
 
 def strip_boilerplate(text: str) -> str:
-    t = re.sub(r"(contact|contato)\b.*?(?=(experience|experiência|education|formação)\b)", "", text, flags=re.I | re.S)
-    t = re.sub(r"\btop\s+skills\b.*?(?=\n|$)", "", t, flags=re.I)
-    t = re.sub(r"Page\s+\d+\s+of\s+\d+", "", t, flags=re.I)
+    t = _cut(text, _contact_spans(text))
+    t = _cut(t, _top_skills_line_spans(t))
+    t = PAGE_FOOTER_RE.sub("", t)
     t = LINKEDIN_URL_RE.sub("", t)
-    t = EMAIL_RE.sub("", t)
+    t = _cut(t, _email_spans(t))
     return norm(t)
 
 def name_from_email(email: str) -> str:
@@ -228,43 +376,106 @@ def name_from_url(url: str) -> str:
 
 def extract_name(text_lines: list[str], url_hint: str = "") -> str:
     for l in text_lines[:150]:
-        m = re.match(r"^([A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][\wÀ-ÿ'’´`\-]+(?:\s+[A-ZÁÉÍÓÚÂÊÔÃÕÄËÏÖÜ][\wÀ-ÿ'’´`\-]+){1,3})\s+"
-                     r"(?:Student|Developer|Engineer|Designer|Software|Estudante|Desenvolvedor|Engenheiro)\b", l, re.I)
+        m = NAME_TITLE_RE.match(l)
         if m: return m.group(1)
     for l in text_lines[:300]:
-        if NAME_LINE_RE.match(l) and not re.search(r"(developer|student|engineer|designer)", l, re.I):
+        if NAME_LINE_RE.match(l) and not NAME_ROLE_RE.search(l):
             return l
     return name_from_url(url_hint)
 
 def extract_age(text: str) -> str:
-    m = re.search(r"\b(?:idade|age)\s*[:\-]?\s*(\d{1,2})\b", text, re.I)
+    m = AGE_RE.search(text)
     return m.group(1) if m else ""
 
 # ---------------- core ----------------
-def parse_pdf(path: str) -> dict:
+_SECTION_HEADS = {
+    "contact": re.compile(r"^\s*(contact|contato)\s*$", re.I | re.M),
+    "experience": re.compile(r"^\s*(experience|experiência)\s*$", re.I | re.M),
+    "education": re.compile(r"^\s*(education|formação acadêmica)\s*$", re.I | re.M),
+}
+
+def _sections_done(text: str) -> bool:
+    # Education is the last section of a LinkedIn export; only trust an Education
+    # header that comes after Experience (the sidebar can repeat the word earlier)
+    if not _SECTION_HEADS["contact"].search(text): return False
+    exp = _SECTION_HEADS["experience"].search(text)
+    return bool(exp and _SECTION_HEADS["education"].search(text, exp.end()))
+
+def load_pdf_backend(mode: str | None = None):
+    """Import the PDF library `mode` reads with (pdfminer, or pypdfium2 for "pdfium")."""
+    if (mode or PDF_TEXT_MODE) == "pdfium" and HAS_PDFIUM:
+        import pypdfium2
+    else:
+        import pdfminer.high_level, pdfminer.converter, pdfminer.layout, pdfminer.pdfinterp, pdfminer.pdfpage
+
+def _pdfminer_pages(path: str, max_pages: int) -> str:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer.pdfpage import PDFPage
+    out, rsrc = io.StringIO(), PDFResourceManager(caching=True)
+    with open(path, "rb") as fh:
+        device = TextConverter(rsrc, out, laparams=LAParams())
+        interp = PDFPageInterpreter(rsrc, device)
+        done = False
+        for n, page in enumerate(PDFPage.get_pages(fh, caching=True), 1):
+            interp.process_page(page)
+            # education entries can spill over, so read one page past its header
+            if done or (max_pages and n >= max_pages):
+                break
+            done = _sections_done(out.getvalue())
+        device.close()
+    return out.getvalue()
+
+def _pdfium_text(path: str) -> str:
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(path)
     try:
-        raw = extract_text(path)
+        return "\n".join(pdf[i].get_textpage().get_text_range() for i in range(len(pdf)))
+    finally:
+        pdf.close()
+
+def pdf_text(path: str, mode: str | None = None, max_pages: int | None = None) -> str:
+    mode = mode or PDF_TEXT_MODE
+    if mode == "full":
+        from pdfminer.high_level import extract_text
+        return extract_text(path)
+    if mode == "fast":
+        return _pdfminer_pages(path, PDF_MAX_PAGES if max_pages is None else max_pages)
+    if mode == "pdfium":
+        if not HAS_PDFIUM: raise RuntimeError("pypdfium2 is not installed")
+        return _pdfium_text(path)
+    raise ValueError(f"unknown PDF text mode {mode!r}")
+
+def parse_pdf(path: str, strict: bool = False, mode: str | None = None) -> dict:
+    try:
+        with timed("pdf_text"): raw = pdf_text(path, mode)
     except Exception as e:
+        if strict: raise
         raw = f"[PDF read error: {e}]"
+    return parse_text(raw, path)
+
+def parse_text(raw: str, path: str = "") -> dict:
     raw = raw.replace("\x00", " ")
     text = norm(raw)
     text_lines = lines(text)
 
-    email = extract_email(text)
-    phone = extract_phone(text)
-    address = extract_address(text_lines, text)
-    url = extract_linkedin_url(text)
-    name = extract_name(text_lines, url_hint=url)
+    with timed("extract.sections"): sections = find_sections(text)
+    with timed("extract.email"): email = extract_email(text)
+    with timed("extract.phone"): phone = extract_phone(text)
+    with timed("extract.address"): address = extract_address(text_lines, text)
+    with timed("extract.linkedin_url"): url = extract_linkedin_url(text)
+    with timed("extract.name"): name = extract_name(text_lines, url_hint=url)
     if not name or name.lower().startswith("profile"):
         name = name_from_url(url) or name_from_email(email) or name or os.path.splitext(os.path.basename(path))[0]
 
-    degree = extract_degree(text)
-    years = extract_years(text)
-    hard, soft = extract_skills(text)
-    langs = extract_languages(text)
+    with timed("extract.degree"): degree = extract_degree(text, sections)
+    with timed("extract.years"): years = extract_years(text)
+    with timed("extract.skills"): hard, soft = extract_skills(text, sections)
+    with timed("extract.languages"): langs = extract_languages(text, sections)
     langs_str = "; ".join(f"{k}: {v or 'unspecified'}" for k, v in sorted(langs.items()))
-    age = extract_age(text)
-    prof = strip_boilerplate(text)[:5000]
+    with timed("extract.age"): age = extract_age(text)
+    with timed("extract.strip_boilerplate"): prof = strip_boilerplate(text)[:5000]
 
     return {
         "name": name,
@@ -290,12 +501,258 @@ def iter_pdf_paths(in_dir: str, pattern: str):
         seen.add(key)
         yield path
 
-def run_to_df(in_dir: str, pattern: str = "*.pdf") -> pd.DataFrame:
-    rows = [parse_pdf(path) for path in iter_pdf_paths(in_dir, pattern)]
+_POOL = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+POOL_IN_FLIGHT = metrics.REGISTRY.add(metrics.Gauge(
+    "ingest_pool_tasks_in_flight", "PDFs submitted to the ingest pool and not finished yet."))
+POOL_IN_FLIGHT.set(0)
+metrics.REGISTRY.add(metrics.Gauge(
+    "ingest_pool_workers", "Worker processes in the ingest pool.",
+    fn=lambda: {(): _POOL_SIZE if _POOL is not None else 0}))
+
+def _pool_context():
+    # workers never fork straight from this process: its other threads (warm-up, requests,
+    # batches) may hold an import or logging lock at that moment, and the child would wait
+    # on it forever. The forkserver is a fresh single-threaded process that preloads this module.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_SIZE != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            # the initializer imports the PDF library once per worker, not on its first file
+            _POOL, _POOL_SIZE = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                                    initializer=load_pdf_backend), workers
+        return _POOL
+
+def _worker_ready():
+    return None
+
+def start_pool(workers: int | None = None) -> int:
+    """Start the ingest pool's workers now instead of on the first multi-PDF request.
+
+    Returns the number of worker processes running; 0 when ingest runs inline.
+    """
+    workers = INGEST_WORKERS if workers is None else max(int(workers), 1)
+    if workers == 1 and not INGEST_TIMEOUT: return 0
+    pool = _get_pool(workers)
+    # one task per worker, so every process is started and initialized before returning
+    for f in [pool.submit(_worker_ready) for _ in range(workers)]:
+        f.result()
+    return len(getattr(pool, "_processes", None) or {})
+
+def _reset_pool(pool: ProcessPoolExecutor):
+    # hung or crashed workers can't be reused; kill them and let the next call fork fresh ones
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _on_alarm(signum, frame):
+    raise TimeoutError("parse timed out")
+
+def _parse_timed(path: str):
+    # stage timings are collected rather than observed, so pool workers can send them back
+    with metrics.collect() as stages, timed("parse_pdf"):
+        row = parse_pdf(path, strict=True)
+    return row, stages
+
+def _parse_job(path: str, timeout: float):
+    # runs inside a pool worker (its own main thread), or inline on the caller's main thread
+    armed = bool(timeout) and hasattr(signal, "setitimer")
+    if armed:
+        prev = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _parse_timed(path)
+    except TimeoutError:
+        raise TimeoutError(f"timed out after {timeout:g}s") from None
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, prev)
+
+def _error(path: str, e) -> dict:
+    msg = e if isinstance(e, str) else (f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)
+    return {"file": os.path.basename(path), "error": msg}
+
+def _parsed(path: str, row: dict, stages) -> dict:
+    metrics.record(stages)
+    metrics.PDFS.inc(outcome="parsed")
+    prof = metrics.current_profile()
+    if prof is not None:
+        prof.files.append({"file": os.path.basename(path),
+                           "seconds": round(sum(t for s, t in stages if s == "parse_pdf"), 6)})
+    return row
+
+def _failed(path: str, e) -> dict:
+    metrics.PDFS.inc(outcome="failed")
+    return _error(path, e)
+
+def _inline(workers: int, n: int, timeout) -> bool:
+    # SIGALRM only reaches the main thread; a timed parse from any other thread (the API's
+    # threadpool) goes through the pool even for a single file
+    if workers > 1 and n > 1: return False
+    return not timeout or (hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread())
+
+def _parse_indices(paths, todo, workers, timeout):
+    if _inline(workers, len(todo), timeout):
+        for i in todo:
+            try:
+                yield i, _parsed(paths[i], *_parse_job(paths[i], timeout)), None
+            except Exception as e:
+                yield i, None, _failed(paths[i], e)
+        return
+
+    # a file lost to a pool reset (its own stall, a crash, or another caller's reset) is
+    # resubmitted to a fresh pool once; failing it again means it is the culprit
+    retried, queue = set(), list(todo)
+    futs, pending = {}, set()
+    # workers enforce the per-file timeout themselves; this only catches a pool that stops making progress
+    stall = 2 * timeout + 5 if timeout else INGEST_STALL
+    why = f"timed out after {timeout:g}s" if timeout else f"no file finished in {stall:g}s"
+
+    def retry(i, e):
+        if i in retried: return i, None, _failed(paths[i], e)
+        retried.add(i)
+        queue.append(i)
+
+    try:
+        while queue or pending:
+            pool = _get_pool(workers)
+            while queue:
+                i = queue.pop(0)
+                try:
+                    f = pool.submit(_parse_job, paths[i], timeout)
+                except RuntimeError as e:
+                    # shut down or broken under us by another caller
+                    _reset_pool(pool)
+                    if (res := retry(i, e)): yield res
+                    break
+                futs[f] = i, pool
+                pending.add(f)
+                POOL_IN_FLIGHT.inc()
+            if not pending: continue
+            done, pending = wait(pending, timeout=stall, return_when=FIRST_COMPLETED)
+            if not done:
+                POOL_IN_FLIGHT.dec(len(pending))
+                running = {f for f in pending if f.running()}
+                _reset_pool(pool)
+                for f in sorted(pending, key=lambda f: futs[f][0]):
+                    i = futs.pop(f)[0]
+                    # files still queued never started and are not to blame for the stall
+                    if f not in running: queue.append(i)
+                    elif (res := retry(i, why)): yield res
+                pending = set()
+                continue
+            POOL_IN_FLIGHT.dec(len(done))
+            for f in sorted(done, key=lambda f: futs[f][0]):
+                i, owner = futs.pop(f)
+                try:
+                    yield i, _parsed(paths[i], *f.result()), None
+                except (BrokenProcessPool, CancelledError) as e:
+                    if isinstance(e, BrokenProcessPool): _reset_pool(owner)
+                    if (res := retry(i, e)): yield res
+                except Exception as e:
+                    yield i, None, _failed(paths[i], e)
+    finally:
+        # a caller that stops early (a streaming client went away) leaves no queued files behind
+        for f in pending: f.cancel()
+        POOL_IN_FLIGHT.dec(len(pending))
+
+def iter_parse(paths, workers: int | None = None, timeout: float | None = None,
+               cache=None, digests=None):
+    """Yield (index, row, error) as each PDF finishes; exactly one of row/error is None.
+
+    With a ParseCache, rows whose sha256 is already stored are yielded first without
+    touching pdfminer; `digests` may be passed when the caller hashed the bytes already.
+    When digests are known, files with identical bytes are parsed only once.
+    """
+    paths = list(paths)
+    workers = INGEST_WORKERS if workers is None else max(int(workers), 1)
+    timeout = INGEST_TIMEOUT if timeout is None else timeout
+    if cache is None and digests is None:
+        yield from _parse_indices(paths, list(range(len(paths))), workers, timeout)
+        return
+
+    digests = list(digests) if digests is not None else [None] * len(paths)
+    copies: dict = {}   # first index with a given digest -> later indices with the same bytes
+    first_of: dict = {}
+    for i, p in enumerate(paths):
+        try:
+            digests[i] = digests[i] or file_sha256(p)
+        except OSError as e:
+            yield i, None, _failed(p, e)
+            continue
+        if digests[i] in first_of:
+            copies[first_of[digests[i]]].append(i)
+        else:
+            first_of[digests[i]] = i
+            copies[i] = []
+
+    todo = []
+    for i in copies:
+        row = cache.get(digests[i]) if cache is not None else None
+        if row is None:
+            todo.append(i)
+            continue
+        metrics.PDFS.inc(1 + len(copies[i]), outcome="cached")
+        yield i, row, None
+        for j in copies[i]:
+            yield j, dict(row), None
+    for i, row, err in _parse_indices(paths, todo, workers, timeout):
+        if err is None and cache is not None:
+            cache.put(digests[i], row)
+        yield i, row, err
+        metrics.PDFS.inc(len(copies[i]), outcome="cached" if err is None else "failed")
+        for j in copies[i]:
+            yield (j, dict(row), None) if err is None else (j, None, _error(paths[j], err["error"]))
+
+def parse_many(paths, workers: int | None = None, timeout: float | None = None,
+               cache=None, digests=None, duplicates: list | None = None):
+    """Parse PDFs in a process pool; returns (rows in input order, errors).
+
+    With a `duplicates` list, repeats of an earlier candidate (same email or LinkedIn
+    URL, or near-identical profile text) are left out of rows and reported there.
+    """
+    paths = list(paths)
+    rows, errors = [None] * len(paths), []
+    for i, row, err in iter_parse(paths, workers, timeout, cache, digests):
+        if err is None: rows[i] = row
+        else: errors.append((i, err))
+    if duplicates is not None:
+        for i, j, how, sim in find_duplicates(rows):
+            rows[i] = None
+            duplicates.append({"file": os.path.basename(paths[i]), "duplicate_of": os.path.basename(paths[j]),
+                               "match": how, "similarity": sim})
+            metrics.PDFS.inc(outcome="duplicate")
+    return [r for r in rows if r is not None], [e for _, e in sorted(errors, key=lambda t: t[0])]
+
+def rows_to_df(rows) -> pd.DataFrame:
     df = pd.DataFrame(rows)
-    cols = ["name","age","phone","email","address","degree","years_experience",
-            "skills","soft_skills","languages","profile_text","url"]
-    for c in cols:
+    for c in COLUMNS:
         if c not in df.columns:
             df[c] = ""
-    return df[cols]
+    return df[COLUMNS]
+
+def run_to_df(in_dir: str, pattern: str = "*.pdf", workers: int = 1,
+              timeout: float | None = None, errors: list | None = None, cache=None,
+              duplicates: list | None = None) -> pd.DataFrame:
+    paths = list(iter_pdf_paths(in_dir, pattern))
+    if workers == 1 and errors is None and cache is None and duplicates is None:
+        return rows_to_df([parse_pdf(path) for path in paths])
+    rows, errs = parse_many(paths, workers, timeout, cache, duplicates=duplicates)
+    if errors is not None:
+        errors.extend(errs)
+    return rows_to_df(rows)
@@ -1,30 +1,86 @@
 import re
 import pandas as pd
 
+from profile_ingest_pdf import _address_match
+
+# Reference patterns. _address() is the same search as _ADDR_PAT via profile_ingest_pdf's
+# bounded scan. _DEG_PAT means: up to 20 chars (no newline, none starting a duration or
+# month token) before a degree word, then 10-140 chars up to a '|' or newline;
+# _degree_matches() finds the same matches in one pass instead of re-checking the
+# lookahead at every char of every candidate prefix.
 _ADDR_PAT = r"(?i)([A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*[A-ZÁÂÃÉÍÓÚ][\wÀ-ÿ .'-]+,\s*(?:Brasil|Brazil|Portugal|Spain|España))"
 _DEG_PAT = r"(?i)(?:(?!(\d+\s+(anos?|years?)|\(\d+\s+year|\bJan|Feb|Mar|Abr|Apr|Mai|Jun|Jul|Ago|Aug|Sep|Out|Oct|Nov|Dez|Dec\b)).){0,20}" \
            r"(Bachelor|Master|MBA|B\.?Tech|Bacharel|Licenciatura|Mestrado|Doutor)[^|\n]{10,140}"
 
+_DEG_BAD_RE = re.compile(r"\d+\s+(?:anos?|years?)|\(\d+\s+year|\bJan|Feb|Mar|Abr|Apr|Mai|Jun|Jul|Ago|Aug|Sep|Out|Oct|Nov|Dez|Dec\b|\n", re.I)
+# the leading class lets re skip to candidate letters instead of trying every alternative everywhere;
+# the word is captured inside a lookahead so overlapping words ("MBachelor": MBA and Bachelor) are all found
+_DEG_WORD_RE = re.compile(r"(?=[bmld])(?=(Bachelor|Master|MBA|B\.?Tech|Bacharel|Licenciatura|Mestrado|Doutor))", re.I)
+_DEG_TAIL_RE = re.compile(r"[^|\n]{10,140}")
+
 def _slug_to_name(u: str) -> str:
     m = re.search(r"/in/([^/?#]+)", str(u) or "")
     if not m: return ""
     slug = re.sub(r"-\d{3,}$", "", m.group(1))
     return " ".join(w.capitalize() for w in slug.replace("-", " ").split())
 
+def _address(text: str):
+    m = _address_match(text)
+    return m.group(1) if m else None
+
+def _prefix_start(text: str, lo: int, w: int) -> int:
+    # first position after the last char in [lo, w) that the prefix may not cross
+    start = lo
+    for i in range(lo, w):
+        if text[i] == "\n" or _DEG_BAD_RE.match(text, i): start = i + 1
+    return start
+
+def _degree_matches(text: str):
+    """(start, end, degree word) of each _DEG_PAT match, left to right."""
+    words = []
+    for m in _DEG_WORD_RE.finditer(text):
+        tail = _DEG_TAIL_RE.match(text, m.end(1))
+        if tail: words.append((m.start(), m.end(1), tail.end()))
+    pos, k = 0, 0
+    while k < len(words):
+        # leftmost start: the first word at or after pos, preceded by at most 20 allowed chars
+        w = words[k][0]
+        if w < pos:
+            k += 1
+            continue
+        start = _prefix_start(text, max(w - 20, pos), w)
+        # from that start the prefix is greedy: take the furthest word it still reaches
+        while k + 1 < len(words) and words[k + 1][0] <= start + 20 and \
+                _prefix_start(text, start, words[k + 1][0]) == start:
+            k += 1
+        w, w_end, end = words[k]
+        yield start, end, text[w:w_end]
+        pos, k = end, k + 1
+
+def _degree(text: str) -> str:
+    """Degree word of the first _DEG_PAT match ("Bachelor", "MBA"...), or ""."""
+    # str.findall(_DEG_PAT) used to store that match's groups, a tuple like ('', '', 'Bachelor')
+    m = next(_degree_matches(text), None)
+    return m[2] if m else ""
+
 def clean_df(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    """Fill empty address/degree from profile_text and names exported as "Profile (n)".
+
+    Fallbacks only run on the rows that need them; the result shares untouched columns with df.
+    """
+    df = df.copy(deep=False)
+    text = df["profile_text"].astype(str)
 
-    addr = df["profile_text"].astype(str).str.extract(_ADDR_PAT, expand=False)
-    df["address"] = df["address"].where(df["address"].astype(str).str.len().gt(0), addr)
+    empty = ~df["address"].astype(str).str.len().gt(0)
+    if empty.any():
+        df["address"] = df["address"].where(~empty, text[empty].map(_address))
 
-    deg_series = (
-        df["profile_text"].astype(str)
-        .str.findall(_DEG_PAT, flags=re.I)
-        .apply(lambda L: max(L, key=len) if L else "")
-    )
-    df["degree"] = df["degree"].where(df["degree"].astype(str).str.len().gt(0), deg_series)
+    empty = ~df["degree"].astype(str).str.len().gt(0)
+    if empty.any():
+        df["degree"] = df["degree"].where(~empty, text[empty].map(_degree))
 
     mask = df["name"].astype(str).str.match(r"(?i)^profile")
-    df.loc[mask, "name"] = df.loc[mask, "url"].map(_slug_to_name).fillna(df.loc[mask, "name"])
+    if mask.any():
+        df["name"] = df["name"].where(~mask, df.loc[mask, "url"].map(_slug_to_name).fillna(df.loc[mask, "name"]))
 
-    return df
\ No newline at end of file
+    return df
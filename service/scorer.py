@@ -1,11 +1,29 @@
-import math, re
+import hashlib, heapq, json, math, os, re, threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 
+from skill_vectors import vectors_from_env
+
+WEIGHTS = dict(req_hard=0.32, nice_hard=0.12, req_soft=0.12, nice_soft=0.06,
+               exp=0.18, degree=0.08, notes=0.06, langs=0.06)
+REQ_PENALTY = 0.45    # missing any required hard skill
+SOFT_PENALTY = 0.85   # missing any required soft skill
+
+TOKEN_RE = re.compile(r"[a-zA-ZÀ-ÿ0-9\+\#\.]{2,}")
+TOKENS_COL = "tokens"   # optional precomputed profile_text tokens, see text_tokens()
+JOB_CACHE_SIZE = int(os.getenv("JOB_CACHE_SIZE") or 256)
+MATCH_MODES = ("exact", "semantic")
+
 def _to_set(s):
     return {t.strip().lower() for t in str(s or "").replace(";", ",").split(",") if t.strip()}
 
 def _text_tokens(s):
-    return set(re.findall(r"[a-zA-ZÀ-ÿ0-9\+\#\.]{2,}", str(s or "").lower()))
+    return set(TOKEN_RE.findall(str(s or "").lower()))
+
+def text_tokens(s) -> str:
+    """profile_text tokens as stored next to a candidate: sorted, space separated."""
+    return " ".join(sorted(_text_tokens(s)))
 
 def _jacc(a, b):
     if not a and not b: return 1.0
@@ -34,74 +52,488 @@ def _normalize_langs(s: str):
             langs[k] = v or "unspecified"
     return langs
 
-def score_df(df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
-    req        = _to_set(cfg.get("req"))
-    nice       = _to_set(cfg.get("nice"))
-    soft_req   = _to_set(cfg.get("soft_req"))
-    soft_nice  = _to_set(cfg.get("soft_nice"))
-    notes      = _to_set(cfg.get("notes"))
-    want_langs = _to_set(cfg.get("langs"))
-    min_years  = float(cfg.get("min_years") or 0.0)
-    want_degree= str(cfg.get("degree") or "").lower()
-
-    rows = []
-    for _, row in df.iterrows():
-        hard = _to_set(row.get("skills"))
-        soft = _to_set(row.get("soft_skills"))
-        years = _parse_years(row.get("years_experience"))
-        degree_txt = str(row.get("degree") or "").lower()
-        prof_txt = str(row.get("profile_text") or "").lower()
-        words = _text_tokens(prof_txt) | hard | soft
-        langs_map = _normalize_langs(row.get("languages"))
-        langs_have = set(langs_map.keys())
-
-        ok_req, miss_req = _has_all(hard, req)
-        sim_nice = _jacc(hard, nice)
-        ok_soft, miss_soft = _has_all(soft, soft_req)
-        sim_soft = _jacc(soft, soft_nice)
-        exp_score = min(years / min_years, 1.0) if min_years > 0 else 1.0
-        deg_ok = True if not want_degree else (want_degree in degree_txt)
-        notes_hit = _jacc(words, notes) if notes else 1.0
-        langs_ok, miss_langs = _has_all(langs_have, want_langs) if want_langs else (True, [])
-        langs_bonus = _jacc(langs_have, want_langs) if want_langs else 1.0
-
-        w_req_hard   = 0.32
-        w_nice_hard  = 0.12
-        w_req_soft   = 0.12
-        w_nice_soft  = 0.06
-        w_exp        = 0.18
-        w_degree     = 0.08
-        w_notes      = 0.06
-        w_langs      = 0.06
+# ---------------- compiled job configs ----------------
+class JobSpec:
+    """A job config parsed once: normalized requirement sets, thresholds and weights.
+
+    `cfg["weights"]` may override any of WEIGHTS; missing keys keep their defaults and
+    the result is rescaled to sum to 1.
+    """
+
+    def __init__(self, cfg: dict):
+        self.req        = frozenset(_to_set(cfg.get("req")))
+        self.nice       = frozenset(_to_set(cfg.get("nice")))
+        self.soft_req   = frozenset(_to_set(cfg.get("soft_req")))
+        self.soft_nice  = frozenset(_to_set(cfg.get("soft_nice")))
+        self.notes      = frozenset(_to_set(cfg.get("notes")))
+        self.want_langs = frozenset(_to_set(cfg.get("langs")))
+        self.min_years  = float(cfg.get("min_years") or 0.0)
+        if not math.isfinite(self.min_years): raise ValueError("min_years must be a finite number")
+        self.want_degree= str(cfg.get("degree") or "").lower()
+        self.weights = dict(WEIGHTS)
+        extra = dict(cfg.get("weights") or {})
+        if extra:
+            unknown = sorted(set(extra) - set(WEIGHTS))
+            if unknown: raise ValueError(f"unknown weights: {', '.join(unknown)}")
+            w = {k: float(extra.get(k, v)) for k, v in WEIGHTS.items()}
+            total = sum(w.values())
+            # json.loads accepts NaN and Infinity, and both slip past the comparisons below
+            if not all(map(math.isfinite, [*w.values(), total])): raise ValueError("weights must be finite numbers")
+            if min(w.values()) < 0 or total <= 0: raise ValueError("weights must be >= 0 with a positive sum")
+            self.weights = {k: v / total for k, v in w.items()}
+        self.req_penalty, self.soft_penalty = REQ_PENALTY, SOFT_PENALTY
+        # "semantic": skills also match through SKILL_VECTORS_PATH embeddings (see skill_vectors)
+        self.match = str(cfg.get("match") or "exact").lower()
+        if self.match not in MATCH_MODES: raise ValueError(f"match must be one of {', '.join(MATCH_MODES)}")
+        self.vectors = vectors_from_env() if self.match == "semantic" else None
+        if self.match == "semantic" and self.vectors is None:
+            raise ValueError("semantic matching needs SKILL_VECTORS_PATH")
+
+    def max_score_missing_req(self) -> float:
+        """Upper bound of a candidate's score when it lacks a required hard skill."""
+        others = sum(v for k, v in self.weights.items() if k != "req_hard")
+        return round(others * self.req_penalty * 100, 1)
+
+_JOBS: OrderedDict = OrderedDict()
+_JOBS_LOCK = threading.Lock()
+
+def job_key(cfg: dict) -> str:
+    return hashlib.sha256(json.dumps(cfg, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+def compile_job(cfg) -> JobSpec:
+    """JobSpec for cfg, from an LRU cache keyed by the config's hash."""
+    if isinstance(cfg, JobSpec): return cfg
+    key = job_key(cfg)
+    with _JOBS_LOCK:
+        spec = _JOBS.get(key)
+        if spec is not None:
+            _JOBS.move_to_end(key)
+            return spec
+    spec = JobSpec(cfg)
+    with _JOBS_LOCK:
+        _JOBS[key] = spec
+        while len(_JOBS) > JOB_CACHE_SIZE:
+            _JOBS.popitem(last=False)
+    return spec
+
+# ---------------- batch engine ----------------
+# Each set-valued field becomes a sparse binary candidates x vocabulary matrix in COO form
+# (row ids, token ids) over one shared vocabulary; set sizes and overlaps with the job's
+# token sets are then bincount-based sparse mat-vec products instead of per-row Python sets.
+
+def _col(df: pd.DataFrame, name: str) -> pd.Series:
+    if name not in df.columns:
+        return pd.Series([""] * len(df), dtype=object)
+    return df[name].map(lambda v: str(v or "")).reset_index(drop=True)
+
+def _pairs(toks: pd.Series) -> pd.DataFrame:
+    toks = toks.dropna().str.strip().str.lower()
+    toks = toks[toks.str.len() > 0]
+    return pd.DataFrame({"row": toks.index.to_numpy(), "tok": toks.to_numpy()}).drop_duplicates()
+
+def _set_pairs(col: pd.Series) -> pd.DataFrame:
+    # same tokens as _to_set: ',' or ';' separated, stripped, lowercased
+    return _pairs(col.str.replace(";", ",", regex=False).str.split(",").explode())
+
+def _lang_pairs(col: pd.Series) -> pd.DataFrame:
+    # keys of _normalize_langs: "english: fluent; spanish" -> english, spanish
+    return _pairs(col.str.split(";").explode().str.split(":").str[0])
+
+def _token_pairs(col: pd.Series) -> pd.DataFrame:
+    return _pairs(col.str.lower().str.findall(TOKEN_RE).explode())
+
+def _stored_token_pairs(col: pd.Series) -> pd.DataFrame:
+    # text_tokens() output is already lowercased and unique per row
+    toks = col.str.split().explode().dropna()
+    return pd.DataFrame({"row": toks.index.to_numpy(), "tok": toks.to_numpy()})
+
+def _word_pairs(df: pd.DataFrame) -> pd.DataFrame:
+    if TOKENS_COL not in df.columns: return _token_pairs(_col(df, "profile_text"))
+    stored = _col(df, TOKENS_COL)
+    # rows stored before their tokens were computed fall back to tokenizing the text
+    missing = (stored == "").to_numpy()
+    if not missing.any(): return _stored_token_pairs(stored)
+    return pd.concat([_stored_token_pairs(stored[~missing]), _token_pairs(_col(df, "profile_text")[missing])])
+
+class _Coo:
+    """Binary candidates x vocab matrix; `dot(mask)` counts each row's tokens inside a vocab subset."""
+
+    def __init__(self, pairs: pd.DataFrame, vocab: pd.Index, n: int):
+        self.rows = pairs["row"].to_numpy(dtype=np.int64)
+        self.cols = vocab.get_indexer(pairs["tok"].to_numpy())
+        self.n = n
+
+    def nnz(self) -> np.ndarray:
+        return np.bincount(self.rows, minlength=self.n).astype(np.float64)
+
+    def dot(self, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.rows, weights=mask[self.cols].astype(np.float64), minlength=self.n)
+
+def _mask(vocab: pd.Index, terms: set) -> np.ndarray:
+    m = np.zeros(len(vocab), dtype=bool)
+    idx = vocab.get_indexer(list(terms))
+    m[idx[idx >= 0]] = True
+    return m
+
+def _jacc_vec(n_a: np.ndarray, inter: np.ndarray, n_b: int) -> np.ndarray:
+    # _jacc on sizes: both empty -> 1.0, one empty -> 0.0, else |a & b| / |a | b|
+    union = n_a + n_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1), 1.0)
+
+def _soft_hits(pairs: pd.DataFrame, coo: _Coo, vocab: pd.Index, terms: list, vectors) -> np.ndarray:
+    """bool[rows, terms]: the row has a skill equal or close enough to each job term.
+
+    One product between the batch's distinct skills and the job terms; rows then only
+    count their skills per term, like the exact path.
+    """
+    hits = np.zeros((coo.n, len(terms)), dtype=bool)
+    if not terms or not len(pairs): return hits
+    sub = pd.Index(pd.unique(pairs["tok"].to_numpy()))
+    close, at = vectors.matches(sub, terms), vocab.get_indexer(sub)
+    for j in range(len(terms)):
+        mask = np.zeros(len(vocab), dtype=bool)
+        mask[at[close[:, j]]] = True
+        hits[:, j] = coo.dot(mask) > 0
+    return hits
+
+def _reasons(skills: str, soft_skills: str, languages: str, years: float, spec: JobSpec, m: dict) -> str:
+    hard, soft = _to_set(skills), _to_set(soft_skills)
+    langs_have = set(_normalize_langs(languages).keys())
+    # semantic matching passes in what is still missing after near matches
+    miss_req = m["miss_req"] if "miss_req" in m else _has_all(hard, spec.req)[1]
+    miss_soft = m["miss_soft"] if "miss_soft" in m else _has_all(soft, spec.soft_req)[1]
+    _, miss_langs = _has_all(langs_have, spec.want_langs)
+
+    reasons = []
+    reasons.append("obrigatórios: ok" if m["ok_req"] else f"faltam obrigatórios: {', '.join(miss_req)}")
+    if spec.nice: reasons.append(f"desejáveis: {int(m['sim_nice']*100)}%")
+    reasons.append("soft req: ok" if m["ok_soft"] else (f"faltam soft: {', '.join(miss_soft)}" if spec.soft_req else "soft req: n/a"))
+    if spec.soft_nice: reasons.append(f"soft desejáveis: {int(m['sim_soft']*100)}%")
+    reasons.append(f"experiência: {years} de {spec.min_years} anos")
+    reasons.append("grau: ok" if m["deg_ok"] else "grau: não evidenciado")
+    if spec.notes: reasons.append(f"observações: {int(m['notes_hit']*100)}%")
+    if spec.want_langs:
+        reasons.append("idiomas: ok" if m["langs_ok"] else f"idiomas faltando: {', '.join(miss_langs)}")
+    return "; ".join(reasons)
+
+def max_score_missing_req(cfg=None) -> float:
+    """Upper bound of a candidate's score when it lacks a required hard skill."""
+    return compile_job(cfg or {}).max_score_missing_req()
 
+def score_df(df: pd.DataFrame, cfg, limit: int | None = None) -> pd.DataFrame:
+    """Score every row against cfg (a dict or JobSpec) and return them best-first.
+
+    With `limit`, only the best `limit` rows are returned (and get a `motivo`).
+    A `tokens` column (text_tokens of profile_text) skips re-tokenizing the text.
+    """
+    spec = compile_job(cfg)
+    req, nice, soft_req, soft_nice = spec.req, spec.nice, spec.soft_req, spec.soft_nice
+    notes, want_langs, min_years, want_degree = spec.notes, spec.want_langs, spec.min_years, spec.want_degree
+
+    n = len(df)
+    if n == 0:
+        return (df.iloc[0:0].drop(columns=TOKENS_COL, errors="ignore")
+                .assign(score=pd.Series(dtype=float), motivo=pd.Series(dtype=object)).reset_index(drop=True))
+
+    skills, softs, languages = _col(df, "skills"), _col(df, "soft_skills"), _col(df, "languages")
+    hard_p, soft_p, lang_p = _set_pairs(skills), _set_pairs(softs), _lang_pairs(languages)
+    # notes are matched against profile words + hard + soft skills; only tokenize text when needed
+    word_p = (pd.concat([_word_pairs(df), hard_p, soft_p]).drop_duplicates()
+              if notes else hard_p.iloc[0:0])
+
+    terms = [hard_p["tok"], soft_p["tok"], lang_p["tok"], word_p["tok"]]
+    vocab = pd.Index(pd.unique(pd.concat(terms, ignore_index=True).to_numpy()))
+    H, S, L, Wd = (_Coo(p, vocab, n) for p in (hard_p, soft_p, lang_p, word_p))
+
+    n_hard, n_soft, n_lang = H.nnz(), S.nnz(), L.nnz()
+    if spec.vectors is None:
+        ok_req = H.dot(_mask(vocab, req)) == len(req)
+        sim_nice = _jacc_vec(n_hard, H.dot(_mask(vocab, nice)), len(nice))
+        ok_soft = S.dot(_mask(vocab, soft_req)) == len(soft_req)
+        sim_soft = _jacc_vec(n_soft, S.dot(_mask(vocab, soft_nice)), len(soft_nice))
+    else:
+        req_t, soft_req_t = sorted(req), sorted(soft_req)
+        hit_req = _soft_hits(hard_p, H, vocab, req_t, spec.vectors)
+        hit_soft = _soft_hits(soft_p, S, vocab, soft_req_t, spec.vectors)
+        ok_req, ok_soft = hit_req.all(axis=1), hit_soft.all(axis=1)
+        # one candidate skill may cover several job terms, so the overlap can exceed its set size
+        nice_hit = _soft_hits(hard_p, H, vocab, sorted(nice), spec.vectors).sum(axis=1)
+        soft_hit = _soft_hits(soft_p, S, vocab, sorted(soft_nice), spec.vectors).sum(axis=1)
+        sim_nice = np.minimum(_jacc_vec(n_hard, nice_hit, len(nice)), 1.0)
+        sim_soft = np.minimum(_jacc_vec(n_soft, soft_hit, len(soft_nice)), 1.0)
+
+    years = _col(df, "years_experience").map(_parse_years).to_numpy(dtype=np.float64)
+    exp_score = np.minimum(years / min_years, 1.0) if min_years > 0 else np.ones(n)
+    deg_ok = (_col(df, "degree").str.lower().str.contains(want_degree, regex=False).to_numpy(dtype=bool)
+              if want_degree else np.ones(n, dtype=bool))
+    notes_hit = _jacc_vec(Wd.nnz(), Wd.dot(_mask(vocab, notes)), len(notes)) if notes else np.ones(n)
+    if want_langs:
+        lang_hit = L.dot(_mask(vocab, want_langs))
+        langs_ok = lang_hit == len(want_langs)
+        langs_bonus = _jacc_vec(n_lang, lang_hit, len(want_langs))
+    else:
+        langs_ok, langs_bonus = np.ones(n, dtype=bool), np.ones(n)
+
+    w = spec.weights
+    base = (
+        w["req_hard"]  * ok_req.astype(np.float64) +
+        w["nice_hard"] *  sim_nice +
+        w["req_soft"]  * ok_soft.astype(np.float64) +
+        w["nice_soft"] *  sim_soft +
+        w["exp"]       *  exp_score +
+        w["degree"]    * deg_ok.astype(np.float64) +
+        w["notes"]     *  notes_hit +
+        w["langs"]     * np.where(langs_ok, langs_bonus, 0.0)
+    )
+    if req: base = np.where(ok_req, base, base * spec.req_penalty)
+    if soft_req: base = np.where(ok_soft, base, base * spec.soft_penalty)
+
+    score_list = [round(v, 1) for v in (base * 100).tolist()]
+    if limit is None:
+        order = pd.Series(score_list).sort_values(ascending=False).index.to_numpy()
+    else:
+        # bounded top-K: heap selection instead of sorting every row
+        order = np.asarray(heapq.nlargest(max(int(limit), 0), range(n), key=score_list.__getitem__), dtype=np.int64)
+    scores = np.asarray(score_list, dtype=np.float64)
+
+    # reason strings only for the rows being returned
+    cols = [c.tolist() for c in (skills, softs, languages)]
+    flags = [a.tolist() for a in (years, ok_req, sim_nice, ok_soft, sim_soft, deg_ok, notes_hit, langs_ok)]
+    motivo = []
+    for i in order.tolist():
+        yrs, ok_r, s_n, ok_s, s_s, d_ok, n_hit, l_ok = (f[i] for f in flags)
+        m = dict(ok_req=ok_r, sim_nice=s_n, ok_soft=ok_s, sim_soft=s_s, deg_ok=d_ok, notes_hit=n_hit, langs_ok=l_ok)
+        if spec.vectors is not None:
+            m["miss_req"] = [t for t, h in zip(req_t, hit_req[i]) if not h]
+            m["miss_soft"] = [t for t, h in zip(soft_req_t, hit_soft[i]) if not h]
+        motivo.append(_reasons(cols[0][i], cols[1][i], cols[2][i], yrs, spec, m))
+    out = df.iloc[order].drop(columns=TOKENS_COL, errors="ignore").reset_index(drop=True)
+    return out.assign(score=scores[order], motivo=motivo)
+
+# ---------------- many jobs at once ----------------
+# The batch is encoded once: each field's (row, token) pairs sorted by row. Every job's term
+# sets become columns of a terms x jobs 0/1 matrix over the union of all jobs' terms, so a
+# chunk of candidates is scored against every job with one hits @ matrix product per set.
+# Only SCORE_CHUNK_CELLS candidate x job cells are alive at a time.
+SCORE_CHUNK_CELLS = int(os.getenv("SCORE_CHUNK_CELLS") or 1 << 18)
+
+class _Field:
+    """(row, token) pairs of one field, sorted by row, with a row's slice found by bisection."""
+
+    def __init__(self, pairs: pd.DataFrame, n: int):
+        rows = pairs["row"].to_numpy(dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        self.rows = rows[order]
+        codes, self.vocab = pd.factorize(pairs["tok"].to_numpy()[order])
+        self.codes = codes.astype(np.int64)
+        self.nnz = np.bincount(self.rows, minlength=n).astype(np.float64)
+
+    def select(self, rows: np.ndarray):
+        """(position in `rows`, token code) of the pairs of the given sorted rows."""
+        lo, hi = np.searchsorted(self.rows, [rows[0], rows[-1] + 1])
+        r, c = self.rows[lo:hi] - rows[0], self.codes[lo:hi]
+        if len(rows) == rows[-1] - rows[0] + 1: return r, c
+        pos = np.full(rows[-1] - rows[0] + 1, -1, dtype=np.int64)
+        pos[rows - rows[0]] = np.arange(len(rows))
+        local = pos[r]
+        keep = local >= 0
+        return local[keep], c[keep]
+
+class _TermMap:
+    """Which job terms each of a field's tokens counts as: exact equality, or SkillVectors.matches."""
+
+    def __init__(self, field: _Field, terms: list, vectors=None):
+        self.terms = terms
+        if vectors is None:
+            at = pd.Index(terms).get_indexer(field.vocab)
+            tok, term = np.flatnonzero(at >= 0), at[at >= 0]
+        else:
+            tok, term = np.nonzero(vectors.matches(field.vocab, terms)) if terms and len(field.vocab) else ([], [])
+        # CSR over token codes: token v counts as terms[term[start[v]:start[v + 1]]]
+        tok, term = np.asarray(tok, dtype=np.int64), np.asarray(term, dtype=np.int64)
+        self.start = np.concatenate([[0], np.cumsum(np.bincount(tok, minlength=len(field.vocab)))])
+        self.term = term[np.argsort(tok, kind="stable")]
+
+    def hits(self, local: np.ndarray, codes: np.ndarray, m: int) -> np.ndarray:
+        """bool[m, terms]: row has a token counting as each term."""
+        out = np.zeros((m, len(self.terms)), dtype=bool)
+        deg = self.start[codes + 1] - self.start[codes]
+        if deg.sum():
+            rep = np.repeat(np.arange(len(codes)), deg)
+            offs = np.arange(len(rep)) - np.repeat(np.cumsum(deg) - deg, deg)
+            out[local[rep], self.term[self.start[codes[rep]] + offs]] = True
+        return out
+
+def _term_matrix(terms: list, sets: list) -> np.ndarray:
+    # float32 [terms, jobs]: 1 where the term is in the job's set; 0/1 counts are exact in float32
+    at = {t: i for i, t in enumerate(terms)}
+    m = np.zeros((len(terms), len(sets)), dtype=np.float32)
+    for j, s in enumerate(sets):
+        m[[at[t] for t in s], j] = 1.0
+    return m
+
+def _round1(x: np.ndarray) -> np.ndarray:
+    # round(v, 1) like score_df; np.round differs on the ties it rounds half to even
+    out = np.round(x, 1)
+    tie = np.abs(x * 10 - np.floor(x * 10) - 0.5) < 1e-6
+    if tie.any(): out[tie] = [round(v, 1) for v in x[tie].tolist()]
+    return out
+
+class _Batch:
+    """Candidates encoded once for scoring against a fixed list of JobSpecs."""
+
+    def __init__(self, df: pd.DataFrame, specs: list):
+        n = self.n = len(df)
+        self.specs = specs
+        self.skills, self.softs, self.languages = _col(df, "skills"), _col(df, "soft_skills"), _col(df, "languages")
+        hard_p, soft_p = _set_pairs(self.skills), _set_pairs(self.softs)
+        self.hard, self.soft = _Field(hard_p, n), _Field(soft_p, n)
+        self.lang = _Field(_lang_pairs(self.languages), n)
+        notes = any(s.notes for s in specs)
+        self.words = _Field(pd.concat([_word_pairs(df), hard_p, soft_p]).drop_duplicates() if notes
+                            else hard_p.iloc[0:0], n)
+        self.years = _col(df, "years_experience").map(_parse_years).to_numpy(dtype=np.float64)
+        degrees = sorted({s.want_degree for s in specs if s.want_degree})
+        low = _col(df, "degree").str.lower()
+        self.deg = np.column_stack([low.str.contains(d, regex=False).to_numpy(dtype=bool) for d in degrees]
+                                   + [np.ones(n, dtype=bool)])
+        self.deg_at = np.array([degrees.index(s.want_degree) if s.want_degree else len(degrees) for s in specs])
+
+        # per field: terms over all jobs, one term map per match mode, terms x jobs matrices per set
+        self.sem = np.array([s.vectors is not None for s in specs])
+        vectors = next((s.vectors for s in specs if s.vectors is not None), None)
+        self.maps, self.mats = {}, {}
+        for name, field, sets in [("hard", self.hard, ("req", "nice")), ("soft", self.soft, ("soft_req", "soft_nice")),
+                                  ("lang", self.lang, ("want_langs",)), ("words", self.words, ("notes",))]:
+            terms = sorted(set().union(*(getattr(s, k) for s in specs for k in sets)))
+            modes = [(False, None)] + ([(True, vectors)] if vectors is not None and name in ("hard", "soft") else [])
+            self.maps[name] = [(sem, _TermMap(field, terms, vec)) for sem, vec in modes]
+            for k in sets:
+                self.mats[k] = _term_matrix(terms, [getattr(s, k) for s in specs])
+        self.size = {k: np.array([len(getattr(s, k)) for s in specs], dtype=np.float64)
+                     for k in ("req", "nice", "soft_req", "soft_nice", "notes", "want_langs")}
+        self.min_years = np.array([s.min_years for s in specs], dtype=np.float64)
+        self.w = {k: np.array([s.weights[k] for s in specs]) for k in WEIGHTS}
+        self.req_penalty = np.array([s.req_penalty for s in specs])
+        self.soft_penalty = np.array([s.soft_penalty for s in specs])
+
+    def _counts(self, name: str, field: _Field, rows: np.ndarray, sets: tuple) -> tuple:
+        local, codes = field.select(rows)
+        out, hits, maps = [np.zeros((len(rows), len(self.specs))) for _ in sets], {}, self.maps[name]
+        for sem, tmap in maps:
+            h = hits[sem] = tmap.hits(local, codes, len(rows))
+            f = h.astype(np.float32)
+            # with both maps, exact and semantic jobs each take their counts from their own
+            jobs = (self.sem if sem else ~self.sem) if len(maps) > 1 else slice(None)
+            for o, k in zip(out, sets):
+                o[:, jobs] = (f @ self.mats[k][:, jobs]).astype(np.float64)
+        return (*out, hits)
+
+    def components(self, rows: np.ndarray) -> dict:
+        """score_df's per-candidate flags, as [len(rows), jobs] arrays, plus `base` and `score`."""
+        size = self.size
+        c_req, c_nice, hard_hits = self._counts("hard", self.hard, rows, ("req", "nice"))
+        c_sreq, c_snice, soft_hits = self._counts("soft", self.soft, rows, ("soft_req", "soft_nice"))
+        c_lang, _ = self._counts("lang", self.lang, rows, ("want_langs",))
+        c_notes, _ = self._counts("words", self.words, rows, ("notes",))
+
+        ok_req, ok_soft = c_req == size["req"], c_sreq == size["soft_req"]
+        sim_nice = np.minimum(_jacc_vec(self.hard.nnz[rows, None], c_nice, size["nice"]), 1.0)
+        sim_soft = np.minimum(_jacc_vec(self.soft.nnz[rows, None], c_snice, size["soft_nice"]), 1.0)
+        years = self.years[rows, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exp_score = np.where(self.min_years > 0, np.minimum(years / self.min_years, 1.0), 1.0)
+        deg_ok = self.deg[rows][:, self.deg_at]
+        notes_hit = np.where(size["notes"] > 0, _jacc_vec(self.words.nnz[rows, None], c_notes, size["notes"]), 1.0)
+        langs_ok = c_lang == size["want_langs"]
+        langs_bonus = np.where(size["want_langs"] > 0, _jacc_vec(self.lang.nnz[rows, None], c_lang, size["want_langs"]), 1.0)
+
+        w = self.w
         base = (
-            w_req_hard  * (1.0 if ok_req  else 0.0) +
-            w_nice_hard *  sim_nice +
-            w_req_soft  * (1.0 if ok_soft else 0.0) +
-            w_nice_soft *  sim_soft +
-            w_exp       *  exp_score +
-            w_degree    * (1.0 if deg_ok  else 0.0) +
-            w_notes     *  notes_hit +
-            w_langs     * (langs_bonus if langs_ok else 0.0)
+            w["req_hard"]  * ok_req.astype(np.float64) +
+            w["nice_hard"] *  sim_nice +
+            w["req_soft"]  * ok_soft.astype(np.float64) +
+            w["nice_soft"] *  sim_soft +
+            w["exp"]       *  exp_score +
+            w["degree"]    * deg_ok.astype(np.float64) +
+            w["notes"]     *  notes_hit +
+            w["langs"]     * np.where(langs_ok, langs_bonus, 0.0)
         )
+        base = np.where(ok_req, base, base * self.req_penalty)
+        base = np.where(ok_soft, base, base * self.soft_penalty)
+        return dict(ok_req=ok_req, sim_nice=sim_nice, ok_soft=ok_soft, sim_soft=sim_soft, deg_ok=deg_ok,
+                    notes_hit=notes_hit, langs_ok=langs_ok, score=_round1(base * 100),
+                    hard_hits=hard_hits.get(True), soft_hits=soft_hits.get(True))
+
+    def chunks(self, rows: np.ndarray | None = None):
+        rows = np.arange(self.n) if rows is None else rows
+        step = max(SCORE_CHUNK_CELLS // max(len(self.specs), 1), 1)
+        for lo in range(0, len(rows), step):
+            yield rows[lo:lo + step]
 
-        if req and not ok_req: base *= 0.45
-        if soft_req and not ok_soft: base *= 0.85
+def _missing(terms: list, tmap: _TermMap, hits: np.ndarray) -> list:
+    # semantic jobs: required terms without any close enough candidate skill
+    at = {t: i for i, t in enumerate(tmap.terms)}
+    return [t for t in terms if not hits[at[t]]]
 
-        score = round(base * 100, 1)
+def score_matrix(df: pd.DataFrame, cfgs: list) -> np.ndarray:
+    """[candidates, jobs] scores, each column equal to score_df's score for that job."""
+    batch = _Batch(df.reset_index(drop=True), [compile_job(c) for c in cfgs])
+    if batch.n == 0: return np.zeros((0, len(cfgs)))
+    return np.vstack([batch.components(rows)["score"] for rows in batch.chunks()])
 
-        reasons = []
-        reasons.append("obrigatórios: ok" if ok_req else f"faltam obrigatórios: {', '.join(miss_req)}")
-        if nice: reasons.append(f"desejáveis: {int(sim_nice*100)}%")
-        reasons.append("soft req: ok" if ok_soft else (f"faltam soft: {', '.join(miss_soft)}" if soft_req else "soft req: n/a"))
-        if soft_nice: reasons.append(f"soft desejáveis: {int(sim_soft*100)}%")
-        reasons.append(f"experiência: {(_parse_years(row.get('years_experience')))} de {min_years} anos")
-        reasons.append("grau: ok" if deg_ok else "grau: não evidenciado")
-        if notes: reasons.append(f"observações: {int(notes_hit*100)}%")
-        if want_langs:
-            reasons.append("idiomas: ok" if langs_ok else f"idiomas faltando: {', '.join(miss_langs)}")
+def score_many(df: pd.DataFrame, cfgs: list, k: int = 10, best: int = 3):
+    """Score every candidate against every job config in one pass over the batch.
+
+    Returns (tops, best_jobs): tops[j] is score_df(df, cfgs[j], limit=k), and best_jobs has
+    one row per candidate (in df order) with the `best` highest scoring job indices and
+    their scores, best first (ties go to the lower index, as in score_df).
+    """
+    df = df.reset_index(drop=True)
+    specs = [compile_job(c) for c in cfgs]
+    n, J, k, best = len(df), len(specs), max(int(k), 0), min(max(int(best), 0), len(specs))
+    batch = _Batch(df, specs)
+
+    # running top-k per job as one int key: score in tenths, then the lower row wins ties
+    top = np.full((0, J), -1, dtype=np.int64)
+    best_jobs = np.zeros((n, best), dtype=np.int64)
+    best_scores = np.zeros((n, best))
+    for rows in batch.chunks() if n else []:
+        score = batch.components(rows)["score"]
+        tenths = np.rint(score * 10).astype(np.int64)
+        if k:
+            top = np.vstack([top, tenths * (n + 1) + (n - rows[:, None])])
+            if len(top) > k: top = np.take_along_axis(top, np.argpartition(-top, k - 1, axis=0)[:k], axis=0)
+        if best:
+            jkey = tenths * (J + 1) + (J - np.arange(J))
+            pick = np.argsort(-jkey, axis=1, kind="stable")[:, :best]
+            best_jobs[rows] = pick
+            best_scores[rows] = np.take_along_axis(score, pick, axis=1)
+    top = -np.sort(-top, axis=0)
+    top_rows = [n - top[:, j] % (n + 1) for j in range(J)]
 
-        rows.append({**row.to_dict(), "score": score, "motivo": "; ".join(reasons)})
+    # reasons only for the rows that made some job's top-k, a second bounded pass over just those
+    motivo = [dict() for _ in range(J)]
+    want = np.unique(np.concatenate(top_rows)) if J and len(top) else np.zeros(0, dtype=np.int64)
+    cols = [c.tolist() for c in (batch.skills, batch.softs, batch.languages)]
+    for rows in batch.chunks(want) if len(want) else []:
+        comp = batch.components(rows)
+        pos = {r: i for i, r in enumerate(rows.tolist())}
+        for j, spec in enumerate(specs):
+            for r in top_rows[j].tolist():
+                i = pos.get(r)
+                if i is None: continue
+                m = {f: comp[f][i, j].item() for f in ("ok_req", "sim_nice", "ok_soft", "sim_soft",
+                                                      "deg_ok", "notes_hit", "langs_ok")}
+                if spec.vectors is not None:
+                    m["miss_req"] = _missing(sorted(spec.req), batch.maps["hard"][1][1], comp["hard_hits"][i])
+                    m["miss_soft"] = _missing(sorted(spec.soft_req), batch.maps["soft"][1][1], comp["soft_hits"][i])
+                motivo[j][r] = _reasons(cols[0][r], cols[1][r], cols[2][r], batch.years[r].item(), spec, m)
 
-    out = pd.DataFrame(rows).sort_values("score", ascending=False)
-    return out.reset_index(drop=True)
\ No newline at end of file
+    base = df.drop(columns=TOKENS_COL, errors="ignore")
+    tops = []
+    for j in range(J):
+        order = top_rows[j]
+        tops.append(base.iloc[order].reset_index(drop=True).assign(
+            score=(top[:, j] // (n + 1)) / 10, motivo=[motivo[j][r] for r in order.tolist()]))
+    return tops, pd.DataFrame({"best_jobs": best_jobs.tolist(), "best_scores": best_scores.tolist()})
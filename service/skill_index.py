@@ -0,0 +1,93 @@
+import threading
+from collections import defaultdict
+import pandas as pd
+
+from scorer import _to_set, _normalize_langs, compile_job, score_df
+
+FIELDS = ("skills", "soft_skills", "languages")
+
+def _terms(field: str, value) -> set:
+    # same normalization the scorer applies to each field
+    if field == "languages":
+        return set(_normalize_langs(value).keys())
+    return _to_set(value)
+
+class SkillIndex:
+    """Inverted index: (field, normalized term) -> candidate ids."""
+
+    def __init__(self):
+        self.postings = {f: defaultdict(set) for f in FIELDS}
+        self.ids: set = set()
+        self._docs: dict = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "SkillIndex":
+        index = cls()
+        for row in df.to_dict(orient="records"):
+            index.add(row["id"], row)
+        return index
+
+    def add(self, candidate_id, row: dict):
+        cid = int(candidate_id)
+        with self._lock:
+            self._remove(cid)
+            doc = {f: _terms(f, row.get(f)) for f in FIELDS}
+            for f, terms in doc.items():
+                for t in terms:
+                    self.postings[f][t].add(cid)
+            self._docs[cid] = doc
+            self.ids.add(cid)
+
+    def remove(self, candidate_id):
+        with self._lock:
+            self._remove(int(candidate_id))
+
+    def _remove(self, cid: int):
+        doc = self._docs.pop(cid, None)
+        if doc is None: return
+        for f, terms in doc.items():
+            for t in terms:
+                post = self.postings[f].get(t)
+                if post is None: continue
+                post.discard(cid)
+                if not post: del self.postings[f][t]
+        self.ids.discard(cid)
+
+    def all_ids(self) -> set:
+        with self._lock:
+            return set(self.ids)
+
+    def having_all(self, field: str, terms: set) -> set:
+        """Ids whose `field` contains every term (smallest posting list first)."""
+        with self._lock:
+            if not terms: return set(self.ids)
+            posts = sorted((self.postings[field].get(t, set()) for t in terms), key=len)
+            out = set(posts[0])
+            for p in posts[1:]:
+                out &= p
+                if not out: break
+            return out
+
+def search(index: SkillIndex, load, cfg: dict, k: int = 5) -> pd.DataFrame:
+    """Top-k candidates for cfg, scoring only what can still make the cut.
+
+    `load(ids)` returns the candidate rows (with an `id` column) for a list of ids.
+    Candidates holding every `req` skill are scored first; the others are capped at
+    spec.max_score_missing_req() by the required-skill penalty, so they are only scored
+    when the first pass can't fill k slots above that cap.
+    """
+    k = max(int(k), 0)
+    spec = compile_job(cfg)
+    pool = index.all_ids()
+    # semantic matching can satisfy `req` without the literal skill, so nothing is prefiltered
+    hit = index.having_all("skills", spec.req) & pool if spec.req and spec.vectors is None else pool
+    best = score_df(load(sorted(hit)), spec, limit=k)
+    rest = pool - hit
+    if rest and k and (len(best) < k or best["score"].iloc[-1] <= spec.max_score_missing_req()):
+        more = score_df(load(sorted(rest)), spec, limit=k)
+        # ties go to the lower id, as in score_df over the whole store (rows come back by id)
+        best = (pd.concat([best, more], ignore_index=True)
+                .sort_values(["score", "id"], ascending=[False, True], kind="stable")
+                .head(k).reset_index(drop=True))
+    return best
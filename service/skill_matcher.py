@@ -0,0 +1,93 @@
+import hashlib, json, re
+
+# same word boundary as profile_ingest_pdf.contains_phrase
+_EDGE = r"A-Za-z0-9#\+"
+
+def phrase_key(phrase: str) -> str:
+    return " ".join(str(phrase).lower().split())
+
+def _unit(ch: str) -> str:
+    return r"\s+" if ch == " " else re.escape(ch)
+
+def _trie_pattern(node: dict) -> str:
+    # children first, end-of-phrase ("") last, so the regex prefers the longest phrase at a position
+    alts = [_unit(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts: return ""
+    if "" in node: alts.append("")
+    return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+class PhraseMatcher:
+    """Finds every vocabulary phrase in a lowercased text with one regex pass.
+
+    The vocabulary is compiled into a single trie-shaped alternation with contains_phrase's
+    boundary rules, so each text position costs at most one walk down the trie. The regex
+    reports the longest phrase starting at a position; shorter phrases that are prefixes of
+    it (e.g. "spring" inside "spring boot") are confirmed with an anchored match there.
+    """
+
+    def __init__(self, phrases: dict):
+        # phrases: phrase -> iterable of payloads returned by find() when it matches
+        self.payloads: dict[str, set] = {}
+        for phrase, items in phrases.items():
+            key = phrase_key(phrase)
+            if key: self.payloads.setdefault(key, set()).update(items)
+        trie: dict = {}
+        for key in self.payloads:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self.regex = re.compile(rf"(?<![{_EDGE}])(?=({_trie_pattern(trie)})(?![{_EDGE}]))") if trie else None
+        self.prefixes = {
+            key: [key[:i] for i in range(1, len(key)) if key[:i] in self.payloads]
+            for key in self.payloads
+        }
+        self._anchored = {
+            pre: re.compile("".join(map(_unit, pre)) + rf"(?![{_EDGE}])")
+            for pres in self.prefixes.values() for pre in pres
+        }
+
+    def keys(self, text_lc: str) -> set:
+        found = set()
+        if self.regex is None: return found
+        for m in self.regex.finditer(text_lc):
+            key = phrase_key(m.group(1))
+            found.add(key)
+            for pre in self.prefixes.get(key, ()):
+                if pre not in found and self._anchored[pre].match(text_lc, m.start()):
+                    found.add(pre)
+        return found
+
+    def find(self, text_lc: str) -> set:
+        out = set()
+        for key in self.keys(text_lc):
+            out |= self.payloads[key]
+        return out
+
+def load_vocab(path: str) -> dict:
+    """Read a skills vocabulary file.
+
+    JSON object with optional "hard" and "soft" phrase lists and an "aliases" mapping of
+    alias -> canonical phrase, e.g. {"hard": ["kubernetes"], "aliases": {"k8s": "kubernetes"}}.
+    """
+    with open(path, "rb") as fh:
+        blob = fh.read()
+    data = json.loads(blob.decode("utf-8"))
+    return {
+        "hard": [str(s) for s in data.get("hard", [])],
+        "soft": [str(s) for s in data.get("soft", [])],
+        "aliases": {str(k): str(v) for k, v in (data.get("aliases") or {}).items()},
+        "digest": hashlib.sha256(blob).hexdigest()[:12],
+    }
+
+def build_skill_matcher(hard: list, soft: list, aliases: dict | None = None) -> PhraseMatcher:
+    """Matcher whose payloads are ("hard" | "soft", vocabulary entry)."""
+    phrases: dict = {}
+    for cat, vocab in (("hard", hard), ("soft", soft)):
+        for s in vocab:
+            phrases.setdefault(s, set()).add((cat, s))
+    for alias, canon in (aliases or {}).items():
+        for cat, vocab in (("hard", hard), ("soft", soft)):
+            if canon in vocab:
+                phrases.setdefault(alias, set()).add((cat, canon))
+    return PhraseMatcher(phrases)
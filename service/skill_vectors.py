@@ -0,0 +1,76 @@
+"""Offline skill embeddings for semantic matching ("postgres" ~ "postgresql", "k8s" ~ "kubernetes").
+
+Vectors come from a local file named by SKILL_VECTORS_PATH, never from the network:
+  .npz   arrays `terms` (str) and `vectors` (float, one row per term)
+  .json  {"term": [floats], ...}
+Terms are normalized like the scorer's skill sets (lowercase, single spaces) and rows are
+L2-normalized, so a matrix product gives cosine similarities directly.
+"""
+import json, os, threading, zipfile
+import numpy as np
+
+from skill_matcher import phrase_key
+
+SKILL_SIM_THRESHOLD = float(os.getenv("SKILL_SIM_THRESHOLD") or 0.8)
+
+class VectorsUnavailable(RuntimeError):
+    """SKILL_VECTORS_PATH is set but the file can't be read or parsed."""
+
+class SkillVectors:
+    def __init__(self, terms, vectors, threshold: float = SKILL_SIM_THRESHOLD):
+        m = np.asarray(vectors, dtype=np.float32)
+        if m.ndim != 2 or len(m) != len(terms): raise ValueError("expected one vector per term")
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        self.matrix = m / np.where(norms > 0, norms, 1.0)
+        self.index = {}
+        for i, t in enumerate(terms):
+            self.index.setdefault(phrase_key(t), i)
+        self.threshold = float(threshold)
+
+    def __len__(self):
+        return len(self.index)
+
+    def rows(self, terms) -> np.ndarray:
+        """Row of each term in `matrix`, -1 when it has no vector."""
+        get = self.index.get
+        return np.fromiter((get(phrase_key(t), -1) for t in terms), dtype=np.int64, count=len(terms))
+
+    def matches(self, vocab, terms) -> np.ndarray:
+        """bool[len(vocab), len(terms)]: vocab entry i counts as term j.
+
+        True for equal strings, or when both have vectors with cosine >= threshold.
+        """
+        vocab, terms = list(vocab), list(terms)
+        out = np.equal.outer(np.asarray(vocab, dtype=object), np.asarray(terms, dtype=object)).astype(bool)
+        rv, rt = self.rows(vocab), self.rows(terms)
+        iv, it = np.flatnonzero(rv >= 0), np.flatnonzero(rt >= 0)
+        if len(iv) and len(it):
+            sims = self.matrix[rv[iv]] @ self.matrix[rt[it]].T
+            out[np.ix_(iv, it)] |= sims >= self.threshold
+        return out
+
+def load_vectors(path: str, threshold: float = SKILL_SIM_THRESHOLD) -> SkillVectors:
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as data:
+            return SkillVectors([str(t) for t in data["terms"]], data["vectors"], threshold)
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return SkillVectors(list(data), list(data.values()), threshold)
+
+_VECTORS = None
+_LOADED = False
+_LOCK = threading.Lock()
+
+def vectors_from_env() -> SkillVectors | None:
+    """The SKILL_VECTORS_PATH vectors, loaded on first use; None when unset."""
+    global _VECTORS, _LOADED
+    with _LOCK:
+        if not _LOADED:
+            path = os.getenv("SKILL_VECTORS_PATH")
+            try:
+                _VECTORS = load_vectors(path) if path else None
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                # not cached as loaded, so a file fixed later is picked up by the next call
+                raise VectorsUnavailable(f"cannot load SKILL_VECTORS_PATH {path!r}: {e}") from e
+            _LOADED = True
+        return _VECTORS
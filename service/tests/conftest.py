@@ -0,0 +1,53 @@
+import os, sys
+
+import pandas as pd
+import pytest
+
+# the service modules are flat (imported as `scorer`, `api`...), as when run from service/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ---------------- randomized candidates and jobs ----------------
+HARD = ["python", "sql", "docker", "aws", "react", "java", "c++", "c#", ".net", "node.js", "kafka"]
+SOFT = ["communication", "teamwork", "leadership", "ownership", "empatia"]
+LANGS = ["english", "portuguese", "spanish", "french"]
+WORDS = ["fintech", "payments", "data", "platform", "banking", "cloud", "python", "team"]
+
+def _skills(rng, vocab):
+    # mixed case, stray spaces, ';' separators and empty entries, as the extractors may leave them
+    picked = rng.sample(vocab, rng.randint(0, 5))
+    picked = [rng.choice([s, s.upper(), f"  {s} "]) for s in picked]
+    return rng.choice([", ", ";", ",,"]).join(picked)
+
+def _frame(rng, n):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "id": i,
+            "skills": rng.choice([_skills(rng, HARD), "", None]),
+            "soft_skills": rng.choice([_skills(rng, SOFT), ""]),
+            "languages": "; ".join(f"{l}: {rng.choice(['fluent', 'native', ''])}" if rng.random() < 0.7 else l
+                                   for l in rng.sample(LANGS, rng.randint(0, 3))),
+            "years_experience": rng.choice(["", "3", "5.5", "2,5", "12", "abc", "inf", "-1", None, 7]),
+            "degree": rng.choice(["", "Bachelor of Science", "Master in Data", "MBA", None]),
+            "profile_text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))),
+        })
+    df = pd.DataFrame(rows)
+    # duplicated rows make ties in every score
+    return pd.concat([df, df.sample(n // 4, random_state=rng.randint(0, 999))], ignore_index=True)
+
+def _job(rng):
+    def pick(vocab, hi):
+        return ", ".join(rng.sample(vocab, rng.randint(0, hi)))
+    return dict(req=pick(HARD, 3), nice=pick(HARD, 4), soft_req=pick(SOFT, 2), soft_nice=pick(SOFT, 2),
+                langs=pick(LANGS, 2), notes=rng.choice(["", "fintech, payments", "data; cloud"]),
+                min_years=rng.choice([0, 2, 5.0]), degree=rng.choice(["", "bachelor", "mba", "master"]))
+
+@pytest.fixture
+def random_frame():
+    """random_frame(rng, n): n messy candidate rows plus n // 4 duplicated ones (ties)."""
+    return _frame
+
+@pytest.fixture
+def random_job():
+    """random_job(rng): a job config drawn from the same vocabularies as random_frame."""
+    return _job
@@ -0,0 +1,29 @@
+"""_degree_matches against the _DEG_PAT regex it replaces, on fuzzed profile text."""
+import random, re
+
+import pytest
+
+from quick_clean import _DEG_PAT, _degree, _degree_matches
+
+_DEG_RE = re.compile(_DEG_PAT)
+
+# degree words (some overlapping: "MBachelor", "BTechMaster"), prefix blockers and filler
+PIECES = ["Bachelor", "Master", "MBA", "BTech", "B.Tech", "Bacharel", "Doutor", "Mestrado em X", "Licenciatura",
+          "M", "B", "Ba", "Mas", "MB", "achelor", " ", "  ", "\n", "|", "3 anos", "2 years", "(5 year", "Jan",
+          "Feb", "Dec", "Oct ", "abc", "x", "1", "de ", "Computação", "Universidade de Sao Paulo, "]
+
+def _ref(text):
+    return [(m.start(), m.end(), m.group(3)) for m in _DEG_RE.finditer(text)]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_degree_matches_equal_the_regex(seed):
+    rng = random.Random(seed)
+    for _ in range(5000):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(1, 30)))
+        want = _ref(text)
+        assert list(_degree_matches(text)) == want, repr(text)
+        assert _degree(text) == (want[0][2] if want else ""), repr(text)
+
+@pytest.mark.parametrize("text", ["MBachelor of Science in X", "BTechMaster of Data Science", "MMBA in Business, 2019"])
+def test_overlapping_degree_words(text):
+    assert list(_degree_matches(text)) == _ref(text)
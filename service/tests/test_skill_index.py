@@ -0,0 +1,26 @@
+"""search() prunes by the inverted index; its top-k must equal a full score_df's."""
+import random
+
+import pandas as pd
+import pytest
+
+from scorer import WEIGHTS, score_df
+from skill_index import SkillIndex, search
+
+@pytest.mark.parametrize("seed", range(8))
+def test_search_matches_full_score_df(seed, random_frame, random_job):
+    rng = random.Random(200 + seed)
+    # duplicated rows under new ids tie on every score, the store hands rows back by id
+    df = random_frame(rng, rng.choice([10, 60, 200])).assign(id=lambda d: range(1, len(d) + 1))
+    index = SkillIndex.from_df(df)
+    by_id = df.set_index("id")
+    load = lambda ids: by_id.loc[list(ids)].reset_index()
+    # only experience counts: candidates with and without `req` then tie (at 0 and others)
+    only_exp = dict(req="python", min_years=5, weights={w: 0 for w in WEIGHTS} | {"exp": 1})
+    for cfg in [random_job(rng) for _ in range(4)] + [dict(random_job(rng), req="python"), only_exp]:
+        for k in (1, 3, 10, 500):
+            got = search(index, load, cfg, k)
+            want = score_df(df, cfg, limit=k)
+            pd.testing.assert_frame_equal(got[["id", "score", "motivo"]].reset_index(drop=True),
+                                          want[["id", "score", "motivo"]].reset_index(drop=True),
+                                          check_dtype=False)
@@ -0,0 +1,40 @@
+"""BodyLimit refuses oversized uploads before the multipart form is parsed."""
+from typing import List
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from uploads import BodyLimit
+
+LIMIT = 64 << 10
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(BodyLimit, max_bytes=LIMIT)
+    parsed = []
+
+    @app.post("/up")
+    async def up(files: List[UploadFile] = File(...)):
+        parsed.append(len(files))
+        return {"files": len(files)}
+    return TestClient(app), parsed
+
+def _multipart(size):
+    yield b'--b\r\nContent-Disposition: form-data; name="files"; filename="a.pdf"\r\n\r\n'
+    for _ in range(size // 4096): yield b"x" * 4096
+    yield b"\r\n--b--\r\n"
+
+def test_small_upload_passes():
+    client, parsed = _client()
+    assert client.post("/up", files=[("files", ("a.pdf", b"x" * 1000))]).json() == {"files": 1}
+
+def test_declared_length_over_the_limit():
+    client, parsed = _client()
+    r = client.post("/up", files=[("files", ("a.pdf", b"x" * (LIMIT + 1)))])
+    assert r.status_code == 413 and parsed == []
+
+def test_chunked_body_is_cut_off():
+    # no Content-Length: the bytes are counted as they stream in
+    client, parsed = _client()
+    r = client.post("/up", content=_multipart(4 * LIMIT), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert r.status_code == 413 and parsed == []
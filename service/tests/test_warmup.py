@@ -0,0 +1,31 @@
+"""A request that lands while the warm-up is still running must not wait on it."""
+import json, os, subprocess, sys
+
+SERVICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+from fastapi.testclient import TestClient
+import api, warmup
+pdf = warmup.sample_pdf()
+with TestClient(api.app) as client:
+    t = time.perf_counter()
+    r = client.post("/score/pdfs", data={"req": "python"},
+                    files=[("files", (f"p{i}.pdf", pdf, "application/pdf")) for i in range(3)])
+    took = time.perf_counter() - t
+    while warmup.status()["status"] == "warming": time.sleep(0.01)
+    print(json.dumps({"code": r.status_code, "seconds": took, "warmup": warmup.status()}))
+"""
+
+def test_request_during_warmup():
+    # a fresh interpreter, so the warm-up really is the first thing that imports pdfminer and forks the pool
+    env = dict(os.environ, WARMUP="1", INGEST_WORKERS="2", INGEST_TIMEOUT="5",
+               PARSE_CACHE_PATH="", CANDIDATE_DB_PATH="", BATCH_DB_PATH="")
+    res = subprocess.run([sys.executable, "-W", "ignore", "-c", CHILD], cwd=SERVICE, env=env,
+                         capture_output=True, text=True, timeout=120)
+    assert res.returncode == 0, res.stderr[-2000:]
+    out = json.loads(res.stdout.strip().splitlines()[-1])
+    assert out["code"] == 200
+    assert out["warmup"]["status"] == "ready", out["warmup"]
+    # well under the pool's stall watchdog (2 * INGEST_TIMEOUT + 5)
+    assert out["seconds"] < 10, out
@@ -0,0 +1,71 @@
+import hashlib, os
+from typing import Any, Dict, List
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+UPLOAD_CHUNK = 1 << 20
+MAX_FILE_BYTES = int(float(os.getenv("MAX_UPLOAD_FILE_MB") or 25) * (1 << 20))
+MAX_REQUEST_BYTES = int(float(os.getenv("MAX_UPLOAD_REQUEST_MB") or 1024) * (1 << 20))
+
+class BodyLimit:
+    """ASGI middleware: 413 as soon as a request body passes max_bytes, before the form is parsed.
+
+    Starlette spools every multipart file before the endpoint runs, so spool_uploads' own
+    checks come too late to save the disk. A declared Content-Length over the limit is refused
+    unread; otherwise the bytes are counted as they arrive, which also covers chunked bodies.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app, self.max_bytes = app, max_bytes
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(status_code=413, detail=f"upload larger than {self.max_bytes / (1 << 20):g} MB")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http": return await self.app(scope, receive, send)
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            return await JSONResponse({"detail": self._too_large().detail}, status_code=413)(scope, receive, send)
+        seen = 0
+        async def receive_counted():
+            nonlocal seen
+            msg = await receive()
+            if msg["type"] == "http.request":
+                seen += len(msg.get("body", b""))
+                # raised inside the form parser, so the app's exception handling turns it into the 413
+                if seen > self.max_bytes: raise self._too_large()
+            return msg
+        await self.app(scope, receive_counted, send)
+
+def safe_name(filename: str | None, i: int) -> str:
+    name = os.path.basename(str(filename or "").replace("\\", "/")).strip()
+    return name if name not in ("", ".", "..") else f"upload_{i}.pdf"
+
+async def spool_uploads(files: List[UploadFile], tmpdir: str,
+                        max_file: int = MAX_FILE_BYTES, max_request: int = MAX_REQUEST_BYTES) -> List[Dict[str, Any]]:
+    """Copy uploads to disk in fixed-size chunks, hashing as they stream.
+
+    Each file goes to its own numbered sub-directory, so two uploads with the same name
+    never overwrite each other and the original name survives for name fallbacks and
+    error reports. Returns [{"path", "filename", "sha256", "size"}] in upload order.
+    """
+    saved, total = [], 0
+    for i, f in enumerate(files):
+        name = safe_name(f.filename, i)
+        sub = os.path.join(tmpdir, f"{i:05d}")
+        os.mkdir(sub)
+        path = os.path.join(sub, name)
+        h, size = hashlib.sha256(), 0
+        with open(path, "wb") as fh:
+            while chunk := await f.read(UPLOAD_CHUNK):
+                size += len(chunk)
+                total += len(chunk)
+                if size > max_file:
+                    raise HTTPException(status_code=413, detail=f"{name}: file larger than {max_file / (1 << 20):g} MB")
+                if total > max_request:
+                    raise HTTPException(status_code=413, detail=f"upload larger than {max_request / (1 << 20):g} MB")
+                h.update(chunk)
+                fh.write(chunk)
+        await f.close()
+        saved.append({"path": path, "filename": name, "sha256": h.hexdigest(), "size": size})
+    return saved
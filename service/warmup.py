@@ -0,0 +1,116 @@
+"""Warm start: run the whole pipeline once on a built-in sample before real traffic arrives.
+
+The first request otherwise pays for importing the PDF library, pdfminer's font and layout
+setup, the regexes that re compiles on first use (quick_clean, pandas .str), the skill
+vectors file and starting the ingest pool. warm() does all of that up front; start() runs it
+in a background thread so the server accepts connections meanwhile. The pool's workers come
+from a forkserver and import the PDF library themselves, so a request that arrives meanwhile
+can start or use the pool without waiting on this thread.
+"""
+import os, tempfile, threading, time, traceback
+
+import encoding
+import profile_ingest_pdf as P
+from dedup import signature
+from quick_clean import clean_df
+from scorer import compile_job, score_df
+from skill_vectors import vectors_from_env
+
+WARMUP = (os.getenv("WARMUP") or "1").lower() not in ("0", "false", "no", "off")
+
+SAMPLE_LINES = [
+    "Contact", "ana.silva@example.com", "+55 11 91234-5678", "www.linkedin.com/in/ana-silva-123",
+    "Top Skills", "Python", "SQL", "Docker",
+    "Languages", "English (Full Professional)", "Portuguese (Native or Bilingual)",
+    "Ana Silva", "Software Engineer", "Sao Paulo, Sao Paulo, Brasil",
+    "Summary", "Backend developer working with python, kubernetes, aws and kafka.",
+    "Communication, teamwork and ownership in fintech payments teams.",
+    "Experience", "Acme Pay", "Software Engineer", "January 2019 - Present (5 years 2 months)",
+    "Education", "Universidade de Sao Paulo", "Bachelor of Science, Computer Science (2014 - 2018)",
+    "Page 1 of 1",
+]
+SAMPLE_JOB = dict(degree="bachelor", req="python, sql", nice="docker, aws", soft_req="communication",
+                  soft_nice="teamwork", langs="english", min_years=3, notes="fintech, payments")
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def sample_pdf(lines=SAMPLE_LINES) -> bytes:
+    """A one-page PDF with `lines` in Helvetica, enough to run the extractor end to end."""
+    text = " ".join(f"({_pdf_escape(l)}) '" for l in lines)
+    content = f"BT /F1 10 Tf 14 TL 40 800 Td {text} ET".encode("latin-1")
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
+
+def warm(pool: bool = True) -> dict:
+    """Run every stage once on the sample profile; {stage: seconds}."""
+    seconds = {}
+    def step(name, fn):
+        t = time.perf_counter()
+        out = fn()
+        seconds[name] = round(time.perf_counter() - t, 6)
+        return out
+
+    step("pdf_backend", P.load_pdf_backend)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Profile (1).pdf")
+        with open(path, "wb") as fh:
+            fh.write(sample_pdf())
+        step("pdf_text", lambda: P.pdf_text(path))
+    row = step("parse_text", lambda: P.parse_text("\n".join(SAMPLE_LINES), "Profile (1).pdf"))
+    # empty fields and an exported name send clean_df down its fallback paths too
+    df = P.rows_to_df([row, dict(row, name="Profile (1)", address="", degree="")])
+    df = step("clean_df", lambda: clean_df(df).fillna(""))
+    step("signature", lambda: signature(row["profile_text"]))
+    step("skill_vectors", vectors_from_env)
+    cfg = dict(SAMPLE_JOB, match="semantic") if vectors_from_env() is not None else SAMPLE_JOB
+    scored = step("score_df", lambda: score_df(df, compile_job(cfg)))
+    step("encode", lambda: (encoding.dumps(encoding.records(scored)), encoding.dumps(encoding.columns(scored))))
+    if pool: step("ingest_pool", P.start_pool)
+    return seconds
+
+_STATE = {"status": "cold", "seconds": {}, "error": ""}
+_LOCK = threading.Lock()
+
+def status() -> dict:
+    """{"status": "cold" | "warming" | "ready" | "failed", "seconds": {stage: s}, "error": str}"""
+    with _LOCK:
+        return {**_STATE, "seconds": dict(_STATE["seconds"])}
+
+def _run():
+    t = time.perf_counter()
+    try:
+        seconds = warm()
+    except Exception as e:
+        # a failed warm-up only means a slower first request; report it, don't stop the server
+        with _LOCK: _STATE.update(status="failed", error="".join(traceback.format_exception_only(e)).strip())
+        return
+    seconds["total"] = round(time.perf_counter() - t, 6)
+    with _LOCK: _STATE.update(status="ready", seconds=seconds)
+
+def start(background: bool = True) -> threading.Thread | None:
+    """Warm up once per process (no-op when WARMUP=0 or already started)."""
+    with _LOCK:
+        if not WARMUP or _STATE["status"] != "cold": return None
+        _STATE["status"] = "warming"
+    if not background:
+        _run()
+        return None
+    th = threading.Thread(target=_run, name="warmup", daemon=True)
+    th.start()
+    return th